@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import UserAccount
+from .models import EmailOutbox, UserAccount
 
 admin.site.register(UserAccount)
+admin.site.register(EmailOutbox)
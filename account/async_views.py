@@ -0,0 +1,18 @@
+from django.db.models import aprefetch_related_objects
+from rest_framework import exceptions
+
+from house.async_views import async_api_view, field_selection, json_response
+
+from .serializers import UserAccountSerializer
+
+
+@async_api_view
+async def profile(request):
+    if not request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+
+    account = request.user.account
+    serializer = UserAccountSerializer(account, **field_selection(request))
+    if "favourites" in serializer.fields:
+        await aprefetch_related_objects([account], "favourites")
+    return json_response(serializer.data)
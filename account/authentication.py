@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import threading
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.user = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def coalesced_authenticate(username, password):
+    # Concurrent attempts with the same credentials wait for the one already
+    # hashing the password instead of each running the full hasher.
+    key = hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{username}\0{password}".encode(),
+        hashlib.sha256,
+    ).digest()
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        return flight.user
+    try:
+        flight.user = authenticate(username=username, password=password)
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+    return flight.user
+
+
+def token_cache_key(key):
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(token):
+    if token is not None:
+        cache.delete(token_cache_key(token.key))
+
+
+def invalidate_user_tokens(user_id):
+    # Drops every cached token of the user once the change has committed.
+    def invalidate():
+        keys = Token.objects.filter(user_id=user_id).values_list("key", flat=True)
+        cache.delete_many([token_cache_key(key) for key in keys])
+
+    transaction.on_commit(invalidate)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    # Caches the token together with its user and the user's UserAccount, so
+    # an authenticated request and request.user.account need no queries.
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user__account").get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            cache.set(cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
+
+    async def aauthenticate(self, request):
+        # Counterpart of authenticate() for plain async Django views.
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_("Invalid token header."))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_("Invalid token header."))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = await cache.aget(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related("user__account").aget(
+                    key=key
+                )
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            await cache.aset(cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
@@ -0,0 +1,84 @@
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Each hasher keeps Django's algorithm name, so existing hashes keep
+# verifying, and reads its cost from settings. When the configured cost or
+# the preferred hasher changes, must_update() reports the stored hash as
+# outdated and check_password() re-hashes it on the next successful login.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHER_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_HASHER_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_SCRYPT_PARALLELISM
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        # Django's encode() passes a fixed maxmem, and OpenSSL's 32 MiB default
+        # rejects work factors above 2**14. The limit is sized from the hash
+        # being made or verified, not the settings, so hashes stronger than
+        # the configured cost still verify and can be rehashed down.
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r,
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash_)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    # Needs argon2-cffi, which is only loaded when an argon2 hash is made or
+    # checked.
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHER_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_ARGON2_PARALLELISM
+
+
+HASHERS = {
+    "scrypt": ScryptPasswordHasher,
+    "argon2": Argon2PasswordHasher,
+    "pbkdf2": PBKDF2PasswordHasher,
+}
+
+
+def is_available(hasher):
+    if hasher.library is None:
+        return True
+    try:
+        hasher()._load_library()
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from account.hashers import HASHERS, is_available
+
+# Costs tried by --sweep, cheapest first.
+SWEEP = {
+    "pbkdf2": [
+        {"PASSWORD_HASHER_PBKDF2_ITERATIONS": iterations}
+        for iterations in (100_000, 260_000, 600_000, 1_000_000)
+    ],
+    "scrypt": [
+        {"PASSWORD_HASHER_SCRYPT_WORK_FACTOR": 2**exponent} for exponent in (13, 14, 15)
+    ],
+    "argon2": [
+        {
+            "PASSWORD_HASHER_ARGON2_TIME_COST": time_cost,
+            "PASSWORD_HASHER_ARGON2_MEMORY_COST": memory_cost,
+        }
+        for time_cost, memory_cost in ((1, 19456), (2, 19456), (2, 65536), (2, 102400))
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time hashing and verifying a password with each hasher, at the "
+        "configured cost or across a range of costs, to pick one that fits "
+        "the login latency budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=10)
+        parser.add_argument(
+            "--sweep", action="store_true", help="Try a range of costs per hasher."
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            help="p95 milliseconds a single verification may take.",
+        )
+
+    def handle(self, *args, **options):
+        for name, hasher_class in HASHERS.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if not is_available(hasher_class):
+                self.stdout.write("  not installed")
+                continue
+            for costs in SWEEP[name] if options["sweep"] else [{}]:
+                with override_settings(**costs):
+                    hash_p50, hash_p95, verify_p95 = self.measure(
+                        hasher_class(), options["rounds"]
+                    )
+                    label = self.describe(name)
+                fits = ""
+                if options["budget"] is not None:
+                    fits = (
+                        self.style.SUCCESS("  fits")
+                        if verify_p95 <= options["budget"]
+                        else self.style.ERROR("  over budget")
+                    )
+                self.stdout.write(
+                    f"  {label:<40} hash p50 {hash_p50:8.1f} ms  "
+                    f"p95 {hash_p95:8.1f} ms  verify p95 {verify_p95:8.1f} ms{fits}"
+                )
+
+    def measure(self, hasher, rounds):
+        hash_timings, verify_timings = [], []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            encoded = hasher.encode("correct horse battery", hasher.salt())
+            hash_timings.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            hasher.verify("correct horse battery", encoded)
+            verify_timings.append(time.perf_counter() - started)
+        return (
+            statistics.median(hash_timings) * 1000,
+            self.p95(hash_timings) * 1000,
+            self.p95(verify_timings) * 1000,
+        )
+
+    def p95(self, timings):
+        timings = sorted(timings)
+        return timings[int(0.95 * (len(timings) - 1))]
+
+    def describe(self, name):
+        prefix = f"PASSWORD_HASHER_{name.upper()}_"
+        return ", ".join(
+            f"{setting[len(prefix):].lower()}={getattr(settings, setting)}"
+            for setting in sorted(set(dir(settings)))
+            if setting.startswith(prefix)
+        )
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from account.outbox import send_pending_emails
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox in batches, retrying with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new emails."
+        )
+        parser.add_argument("--interval", type=float, default=5)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        while True:
+            processed = send_pending_emails(batch_size, options["max_attempts"])
+            if processed:
+                self.stdout.write(f"Processed {processed} emails.")
+            if processed < batch_size:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
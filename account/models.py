@@ -2,6 +2,7 @@ import uuid
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
 
 class UserAccount(models.Model):
@@ -11,7 +12,9 @@ class UserAccount(models.Model):
     user = models.OneToOneField(User, related_name="account", on_delete=models.CASCADE)
     address = models.CharField(max_length=100)
     # image = models.ImageField(upload_to="account/user/profile/")
+    # Holds the URL of the stored image, see house.images.
     image = models.TextField()
+    image_thumbnail = models.CharField(max_length=500, blank=True)
     mobile_number = models.CharField(max_length=12)
     is_verified = models.BooleanField(default=False)
     verification_token = models.UUIDField(
@@ -26,6 +29,37 @@ class UserAccount(models.Model):
         related_name="favourite",
         blank=True,
     )
+    # Also bumped when the user or the favourites change, so the ETags of
+    # responses embedding the account change with it.
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
+
+    @classmethod
+    def touch(cls, **lookup):
+        cls.objects.filter(**lookup).update(updated_at=timezone.now())
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("SENT", "Sent"),
+        ("FAILED", "Failed"),
+    ]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to}"
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+
+def queue_email(to, subject, template_name, context):
+    return EmailOutbox.objects.create(
+        to=to,
+        subject=subject,
+        html_body=render_to_string(template_name, context),
+    )
+
+
+def send_pending_emails(batch_size=50, max_attempts=5):
+    with transaction.atomic():
+        messages = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status="PENDING", next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not messages:
+            return 0
+
+        processed = 0
+        try:
+            # One SMTP connection is opened and reused for the whole batch.
+            with get_connection() as connection:
+                for message in messages:
+                    _send(message, connection, max_attempts)
+                    processed += 1
+        except Exception as error:
+            for message in messages[processed:]:
+                _record_failure(message, error, max_attempts)
+
+        EmailOutbox.objects.bulk_update(
+            messages,
+            ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+        )
+    return len(messages)
+
+
+def _send(message, connection, max_attempts):
+    email = EmailMultiAlternatives(
+        message.subject, "", to=[message.to], connection=connection
+    )
+    email.attach_alternative(message.html_body, "text/html")
+    try:
+        email.send()
+    except Exception as error:
+        _record_failure(message, error, max_attempts)
+    else:
+        message.status = "SENT"
+        message.sent_at = timezone.now()
+        message.last_error = ""
+
+
+def _record_failure(message, error, max_attempts):
+    message.attempts += 1
+    message.last_error = str(error) or type(error).__name__
+    if message.attempts >= max_attempts:
+        message.status = "FAILED"
+    else:
+        delay = min(
+            settings.EMAIL_OUTBOX_BACKOFF * 2 ** (message.attempts - 1),
+            settings.EMAIL_OUTBOX_MAX_BACKOFF,
+        )
+        message.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -1,6 +1,14 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
+from house.images import (
+    ImageReferenceField,
+    save_image,
+    schedule_thumbnail,
+    storage_name,
+)
+from house.mixins import SparseFieldsetMixin
+
 from .models import UserAccount
 
 
@@ -11,7 +19,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         choices=[("Admin", "Admin"), ("User", "User")]
     )
     address = serializers.CharField(required=True)
-    image = serializers.CharField(required=True)
+    image = ImageReferenceField(prefix="account", required=True)
     mobile_number = serializers.CharField(required=True)
 
     class Meta:
@@ -52,13 +60,15 @@ class RegistrationSerializer(serializers.ModelSerializer):
         user.is_active = False
         user.save()
 
-        UserAccount.objects.create(
+        user_account = UserAccount.objects.create(
             user=user,
             account_type=validated_data["account_type"],
             address=validated_data["address"],
-            image=validated_data["image"],
+            image=save_image(validated_data["image"]),
             mobile_number=validated_data["mobile_number"],
         )
+        if storage_name(user_account.image):
+            schedule_thumbnail(user_account)
 
         return user
 
@@ -68,15 +78,17 @@ class UserLoginSerializer(serializers.Serializer):
     password = serializers.CharField(max_length=32, required=True)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "first_name", "last_name"]
 
 
-class UserAccountSerializer(serializers.ModelSerializer):
+class UserAccountSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
+    compact_fields = ["id", "user", "account_type", "image", "image_thumbnail"]
+
     class Meta:
         model = UserAccount
 
@@ -86,7 +98,21 @@ class UserAccountSerializer(serializers.ModelSerializer):
             "account_type",
             "address",
             "image",
+            "image_thumbnail",
             "mobile_number",
             "is_verified",
             "favourites",
         ]
+
+
+class FavouritesBulkSerializer(serializers.Serializer):
+    add = serializers.ListField(
+        child=serializers.IntegerField(), default=list, max_length=1000
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(), default=list, max_length=1000
+    )
+
+
+class FavouritesSyncSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), max_length=1000)
@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from house.caching import invalidate_advertisement_list
+from house.models import Advertisement
+
+from .authentication import invalidate_user_tokens, token_cache_key
+from .models import UserAccount
+
+# The owner fields shown in the cached advertisement list pages.
+LISTED_OWNER_FIELDS = {
+    User: {"username", "email", "first_name", "last_name"},
+    UserAccount: {"account_type", "image", "image_thumbnail"},
+}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserAccount)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Cached tokens carry the user and account, so changes made outside the
+    # account views (e.g. in the admin) drop them too. The cache is per
+    # process unless CACHE_URL points at a shared one.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    user_id = instance.pk if sender is User else instance.user_id
+    if sender is User:
+        UserAccount.touch(user_id=user_id)
+    invalidate_user_tokens(user_id)
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=UserAccount)
+def owner_saving(sender, instance, update_fields=None, **kwargs):
+    # Logins, confirmations and password changes leave the cached listing
+    # alone; it is dropped only when a listed owner's shown fields change.
+    fields = LISTED_OWNER_FIELDS[sender]
+    if update_fields is not None:
+        fields = fields.intersection(update_fields)
+    if not fields or instance.pk is None:
+        return
+    owner = "house__owner__user" if sender is User else "house__owner"
+    if not Advertisement.objects.filter(
+        is_approved=True, **{owner: instance.pk}
+    ).exists():
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if stored is None or any(
+        stored[field] != getattr(instance, field) for field in fields
+    ):
+        invalidate_advertisement_list()
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    # Also runs for the tokens a deleted User cascades to, so revoked tokens
+    # and those of deleted users stop authenticating at once.
+    cache_key = token_cache_key(instance.key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
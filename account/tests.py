@@ -0,0 +1,374 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from house.models import Category
+from rent_ease import metrics
+from house.tests import create_advertisement
+
+from .authentication import coalesced_authenticate
+from .models import EmailOutbox, UserAccount
+from .outbox import send_pending_emails
+from .throttling import TokenBucketThrottle, local_buckets
+
+
+class RegistrationOutboxTests(APITestCase):
+    def register(self):
+        return self.client.post(
+            "/account/register/",
+            {
+                "username": "tenant",
+                "email": "tenant@example.com",
+                "first_name": "Ten",
+                "last_name": "Ant",
+                "password": "s3cret-pass",
+                "confirm_password": "s3cret-pass",
+                "account_type": "User",
+                "address": "Dhaka",
+                "image": "https://example.com/me.jpg",
+                "mobile_number": "01700000000",
+            },
+        )
+
+    def test_registration_queues_confirmation_email(self):
+        response = self.register()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(send_pending_emails(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["tenant@example.com"])
+        self.assertIn("/account/active/", mail.outbox[0].alternatives[0][0])
+        self.assertEqual(EmailOutbox.objects.get().status, "SENT")
+        self.assertEqual(send_pending_emails(), 0)
+
+    def test_failed_email_is_retried_with_backoff(self):
+        self.register()
+        with mock.patch(
+            "django.core.mail.EmailMultiAlternatives.send", side_effect=OSError
+        ):
+            send_pending_emails(max_attempts=2)
+
+        message = EmailOutbox.objects.get()
+        self.assertEqual((message.status, message.attempts), ("PENDING", 1))
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertEqual(send_pending_emails(), 0)
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now() - timedelta(1))
+        with mock.patch(
+            "django.core.mail.EmailMultiAlternatives.send", side_effect=OSError
+        ):
+            send_pending_emails(max_attempts=2)
+        self.assertEqual(EmailOutbox.objects.get().status, "FAILED")
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username="tenant", password="s3cret-pass")
+        UserAccount.objects.create(user=user, address="Dhaka", is_verified=True)
+        self.token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.async_client = AsyncClient()
+
+    def test_profile_is_served_without_auth_queries(self):
+        self.assertEqual(self.client.get("/account/profile/").status_code, 200)
+        # Only the favourites of the serialized account are queried.
+        with self.assertNumQueries(1):
+            response = self.client.get("/account/profile/")
+        self.assertEqual(response.data["address"], "Dhaka")
+
+    def test_profile_fields_skip_favourites_query(self):
+        self.client.get("/account/profile/")
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/account/profile/", {"fields": "id,address,user.username"}
+            )
+        self.assertEqual(
+            response.data,
+            {
+                "id": response.data["id"],
+                "address": "Dhaka",
+                "user": {"username": "tenant"},
+            },
+        )
+
+    async def test_async_profile_matches_sync_profile(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        anonymous = await self.async_client.get("/account/async/profile/")
+        invalid = await self.async_client.get(
+            "/account/async/profile/", headers={"Authorization": "Token nope"}
+        )
+        profile = await self.async_client.get(
+            "/account/async/profile/", headers=headers
+        )
+
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertEqual(invalid.status_code, 401)
+        self.assertEqual(profile.json()["address"], "Dhaka")
+        self.assertEqual(profile.json()["favourites"], [])
+
+    def test_profile_update_invalidates_cached_account(self):
+        self.client.get("/account/profile/")
+        self.client.post("/account/updateProfile/", {"address": "Sylhet"})
+        self.assertEqual(self.client.get("/account/profile/").data["address"], "Sylhet")
+
+    def test_profile_update_keeps_changes_made_since_caching(self):
+        self.client.get("/account/profile/")
+        # As when another process changes the user without touching this cache.
+        User.objects.filter(username="tenant").update(is_staff=True)
+
+        self.client.post("/account/updateProfile/", {"first_name": "Tina"})
+
+        user = User.objects.get(username="tenant")
+        self.assertTrue(user.is_staff)
+        self.assertEqual(user.first_name, "Tina")
+
+    def test_saving_the_user_elsewhere_invalidates_cached_token(self):
+        self.client.get("/account/profile/")
+        user = User.objects.get(username="tenant")
+        user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        self.assertEqual(self.client.get("/account/profile/").status_code, 401)
+
+    def test_deleting_the_token_invalidates_it(self):
+        self.client.get("/account/profile/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Token.objects.filter(pk=self.token.pk).delete()
+
+        self.assertEqual(self.client.get("/account/profile/").status_code, 401)
+
+    def test_deleting_the_user_invalidates_cached_token(self):
+        self.client.get("/account/profile/")
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(username="tenant").delete()
+
+        self.assertEqual(self.client.get("/account/profile/").status_code, 401)
+
+    def test_logout_invalidates_cached_token(self):
+        self.client.get("/account/profile/")
+        self.client.get("/account/logout/")
+        self.assertEqual(self.client.get("/account/profile/").status_code, 401)
+
+
+class FavouritesTests(APITestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="tenant", password="s3cret-pass")
+        self.account = UserAccount.objects.create(user=user)
+        category = Category.objects.create(name="Flat", slug="flat")
+        self.advertisements = [
+            create_advertisement(self.account, category, is_approved=True)
+            for _ in range(3)
+        ]
+        self.ids = [advertisement.id for advertisement in self.advertisements]
+        self.client.force_authenticate(user)
+
+    def test_add_and_remove_single_favourite(self):
+        url = f"/account/profile/favorites/add/{self.ids[0]}/"
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.client.post(url).status_code, 208)
+        self.assertEqual(
+            self.client.post("/account/profile/favorites/add/0/").status_code, 404
+        )
+
+        url = f"/account/profile/favorites/remove/{self.ids[0]}/"
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.client.post(url).status_code, 400)
+
+    def test_bulk_add_remove_and_sync(self):
+        url = "/account/profile/favorites/"
+        response = self.client.post(
+            url, {"add": self.ids + [0], "remove": []}, format="json"
+        )
+        self.assertEqual(response.data["ids"], self.ids)
+
+        response = self.client.post(url, {"remove": self.ids[:2]}, format="json")
+        self.assertEqual(response.data["ids"], self.ids[2:])
+
+        response = self.client.put(url, {"ids": self.ids[:2]}, format="json")
+        self.assertEqual(response.data["ids"], self.ids[:2])
+        self.assertEqual(self.client.get(url).data["ids"], self.ids[:2])
+
+    def test_listing_flags_favourites(self):
+        self.client.post(
+            "/account/profile/favorites/", {"add": self.ids[:1]}, format="json"
+        )
+        response = self.client.get("/house/advertisements/list/")
+        flags = {ad["id"]: ad["is_favourite"] for ad in response.data["results"]}
+        self.assertEqual(
+            flags, {self.ids[0]: True, self.ids[1]: False, self.ids[2]: False}
+        )
+
+
+class LoginThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_buckets.buckets.clear()
+        user = User.objects.create_user(username="tenant", password="s3cret-pass")
+        UserAccount.objects.create(user=user, is_verified=True)
+        rates = mock.patch.dict(
+            api_settings.DEFAULT_THROTTLE_RATES,
+            {"login_ip": "100/min", "login_username": "2/min", "register_ip": "1/hour"},
+        )
+        rates.start()
+        self.addCleanup(rates.stop)
+
+    def login(self, username="tenant", password="wrong", **extra):
+        return self.client.post(
+            "/account/login/", {"username": username, "password": password}, **extra
+        )
+
+    def test_username_bucket_rejects_before_hashing(self):
+        with mock.patch(
+            "account.authentication.authenticate", return_value=None
+        ) as authenticate:
+            statuses = [self.login().status_code for _ in range(3)]
+            other = self.login(username="someone-else")
+
+        self.assertEqual(statuses, [401, 401, 429])
+        self.assertEqual(authenticate.call_count, 3)
+        self.assertEqual(other.status_code, 401)
+        self.assertIn(
+            'http_requests_throttled_total{scope="login_username"} ',
+            metrics.expose(),
+        )
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch.object(TokenBucketThrottle, "timer") as timer:
+            timer.return_value = 1000.0
+            self.login()
+            self.login()
+            rejected = self.login()
+            timer.return_value = 1030.0
+            refilled = self.login(password="s3cret-pass")
+
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected["Retry-After"], "30")
+        self.assertEqual(refilled.status_code, 200)
+
+    def test_ip_bucket_spans_usernames(self):
+        api_settings.DEFAULT_THROTTLE_RATES["login_ip"] = "2/min"
+        statuses = [
+            self.login(username=f"user-{number}").status_code for number in range(3)
+        ]
+        elsewhere = self.login(username="user-3", REMOTE_ADDR="10.0.0.2")
+
+        self.assertEqual(statuses, [401, 401, 429])
+        self.assertEqual(elsewhere.status_code, 401)
+
+    def test_unreachable_cache_falls_back_to_local_buckets(self):
+        broken = mock.Mock(**{"get.side_effect": OSError, "set.side_effect": OSError})
+        with mock.patch.object(TokenBucketThrottle, "cache", broken):
+            with self.assertLogs("account.throttling", "WARNING"):
+                statuses = [self.login().status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [401, 401, 429])
+
+    def test_registration_is_throttled_per_ip(self):
+        first = self.client.post("/account/register/", {})
+        second = self.client.post("/account/register/", {})
+
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(second.status_code, 429)
+
+    def test_non_object_bodies_are_rejected_by_the_serializer(self):
+        for body in ([], ["tenant"]):
+            with self.subTest(body=body):
+                response = self.client.post("/account/login/", body, format="json")
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post("/account/register/", ["tenant"], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_concurrent_identical_attempts_hash_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_authenticate(**credentials):
+            started.set()
+            release.wait(5)
+            return "user"
+
+        with mock.patch(
+            "account.authentication.authenticate", side_effect=slow_authenticate
+        ) as authenticate:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                leader = pool.submit(coalesced_authenticate, "tenant", "pw")
+                started.wait(5)
+                follower = pool.submit(coalesced_authenticate, "tenant", "pw")
+                time.sleep(0.05)
+                release.set()
+                results = [leader.result(), follower.result()]
+
+        self.assertEqual(results, ["user", "user"])
+        self.assertEqual(authenticate.call_count, 1)
+
+
+@override_settings(
+    PASSWORD_HASHER_PBKDF2_ITERATIONS=1000, PASSWORD_HASHER_SCRYPT_WORK_FACTOR=2**10
+)
+class PasswordHasherTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tenant")
+        UserAccount.objects.create(user=self.user, is_verified=True)
+
+    def login(self):
+        return self.client.post(
+            "/account/login/", {"username": "tenant", "password": "s3cret-pass"}
+        )
+
+    def test_new_passwords_use_the_preferred_hasher(self):
+        self.assertTrue(make_password("s3cret-pass").startswith("scrypt$1024$"))
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        self.user.password = make_password("s3cret-pass", hasher="pbkdf2_sha256")
+        self.user.save(update_fields=["password"])
+
+        self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+
+    def test_raised_cost_is_applied_on_login(self):
+        self.user.set_password("s3cret-pass")
+        self.user.save(update_fields=["password"])
+
+        with override_settings(PASSWORD_HASHER_SCRYPT_WORK_FACTOR=2**11):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$2048$"))
+
+    def test_lowered_cost_is_applied_on_login(self):
+        # Above 2**14 scrypt needs more than OpenSSL's default memory limit.
+        with override_settings(PASSWORD_HASHER_SCRYPT_WORK_FACTOR=2**15):
+            self.user.set_password("s3cret-pass")
+        self.user.save(update_fields=["password"])
+
+        self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+
+    def test_benchmark_hashers_reports_each_hasher(self):
+        output = io.StringIO()
+        call_command("benchmark_hashers", rounds=1, budget=1000, stdout=output)
+
+        self.assertIn("work_factor=1024", output.getvalue())
+        self.assertIn("iterations=1000", output.getvalue())
@@ -3,10 +3,12 @@ from django.conf.urls.static import static
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     AddFavorite,
     ChangePasswordView,
     EmailConfirmationView,
+    FavoritesView,
     RemoveFavorite,
     UpdateProfileView,
     UserInfoAPIView,
@@ -24,6 +26,7 @@ urlpatterns = [
     path("profile/", UserInfoAPIView.as_view(), name="user_info"),
     path("updateProfile/", UpdateProfileView.as_view(), name="update_profile"),
     path("change-password/", ChangePasswordView.as_view(), name="change_password"),
+    path("profile/favorites/", FavoritesView.as_view(), name="favorites"),
     path(
         "profile/favorites/add/<int:ad_id>/",
         AddFavorite.as_view(),
@@ -39,6 +42,7 @@ urlpatterns = [
         EmailConfirmationView.as_view(),
         name="email_confirm",
     ),
+    path("async/profile/", async_views.profile, name="async_profile"),
 ]
 
 
@@ -1,35 +1,58 @@
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from house.images import schedule_thumbnail, storage_name, store_image
 from house.models import Advertisement
 
+from .authentication import (
+    CachedTokenAuthentication,
+    coalesced_authenticate,
+    invalidate_token,
+    invalidate_user_tokens,
+)
 from .models import UserAccount
+from .outbox import queue_email
 from .serializers import (
+    FavouritesBulkSerializer,
+    FavouritesSyncSerializer,
     RegistrationSerializer,
     UserAccountSerializer,
     UserLoginSerializer,
 )
+from .throttling import IPTokenBucketThrottle, UsernameTokenBucketThrottle
+
+Favourite = UserAccount.favourites.through
+
+
+def favourites_changed(user):
+    # Listing ETags include the account's updated_at, which cached tokens
+    # carry along with the account.
+    UserAccount.touch(user_id=user.pk)
+    invalidate_user_tokens(user.pk)
 
 
 class UserInfoAPIView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        user_account = UserAccount.objects.get(user=user)
-        user_account_serializer = UserAccountSerializer(user_account)
+        user_account = request.user.account
+        user_account_serializer = UserAccountSerializer(
+            user_account,
+            fields=request.query_params.get("fields"),
+            expand=request.query_params.get("expand"),
+        )
         # print(user_account_serializer, request,user)
 
         return Response(user_account_serializer.data, status=status.HTTP_200_OK)
@@ -37,26 +60,25 @@ class UserInfoAPIView(APIView):
 
 class UserRegisterAPIView(APIView):
     serializer_class = RegistrationSerializer
+    throttle_classes = [IPTokenBucketThrottle, UsernameTokenBucketThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
 
         if serializer.is_valid():
-
-            user = serializer.save()
-            token = default_token_generator.make_token(user)
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            confirm_link = (
-                f"https://house-rent-backend.onrender.com/account/active/{uid}/{token}/"
-            )
-
-            email_subject = "Confirm Your Account"
-            email_body = render_to_string(
-                "confirm_email.html", {"confirm_link": confirm_link}
-            )
-            email = EmailMultiAlternatives(email_subject, "", to=[user.email])
-            email.attach_alternative(email_body, "text/html")
-            email.send()
+            with transaction.atomic():
+                user = serializer.save()
+                token = default_token_generator.make_token(user)
+                uid = urlsafe_base64_encode(force_bytes(user.pk))
+                confirm_link = f"https://house-rent-backend.onrender.com/account/active/{uid}/{token}/"
+
+                queue_email(
+                    user.email,
+                    "Confirm Your Account",
+                    "confirm_email.html",
+                    {"confirm_link": confirm_link},
+                )
 
             return Response(
                 {"message": "Check Your Mail"},
@@ -102,12 +124,15 @@ class EmailConfirmationView(APIView):
 
 
 class UserLoginAPIView(APIView):
+    throttle_classes = [IPTokenBucketThrottle, UsernameTokenBucketThrottle]
+    throttle_scope = "login"
+
     def post(self, request):
         serializer = UserLoginSerializer(data=self.request.data)
         if serializer.is_valid():
             username = serializer.validated_data["username"]
             password = serializer.validated_data["password"]
-            user = authenticate(username=username, password=password)
+            user = coalesced_authenticate(username, password)
             if user:
                 user_account = UserAccount.objects.get(user=user)
                 if user_account.is_verified is True:
@@ -120,12 +145,11 @@ class UserLoginAPIView(APIView):
                         },
                         status=status.HTTP_200_OK,
                     )
-                else:
-                    return Response(
-                        {"error": "Invalid credentials"},
-                        status=status.HTTP_401_UNAUTHORIZED,
-                    )
-        return Response({serializer.errors}, status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {"error": "Invalid credentials"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
 
 class UserLogoutAPIView(APIView):
@@ -133,7 +157,8 @@ class UserLogoutAPIView(APIView):
 
     def get(self, request):
         try:
-            request.user.auth_token.delete()
+            invalidate_token(request.auth)
+            request.auth.delete()
             logout(request)
             return Response(
                 {"detail": "Successfully logged out."}, status=status.HTTP_200_OK
@@ -150,23 +175,35 @@ class UpdateProfileView(APIView):
 
     def post(self, request, *args, **kwargs):
         try:
-            user_account = UserAccount.objects.get(user=request.user)
+            user_account = request.user.account
             user = request.user
-            if "first_name" in request.data:
-                user.first_name = request.data["first_name"]
-            if "last_name" in request.data:
-                user.last_name = request.data["last_name"]
-            if "email" in request.data:
-                user.email = request.data["email"]
-            if "address" in request.data:
-                user_account.address = request.data["address"]
+            # The user and account may come from the token cache, so only the
+            # edited columns are written back; a full save would revert changes
+            # made since they were cached.
+            user_fields = [
+                field
+                for field in ("first_name", "last_name", "email")
+                if field in request.data
+            ]
+            account_fields = [
+                field for field in ("address", "mobile_number") if field in request.data
+            ]
+            for field in user_fields:
+                setattr(user, field, request.data[field])
+            for field in account_fields:
+                setattr(user_account, field, request.data[field])
             if "image" in request.data:
-                user_account.image = request.data["image"]
-            if "mobile_number" in request.data:
-                user_account.mobile_number = request.data["mobile_number"]
-
-            user.save()
-            user_account.save()
+                user_account.image = store_image(request.data["image"], "account")
+                user_account.image_thumbnail = ""
+                account_fields += ["image", "image_thumbnail"]
+
+            if user_fields:
+                user.save(update_fields=user_fields)
+            if account_fields:
+                user_account.save(update_fields=[*account_fields, "updated_at"])
+            invalidate_token(request.auth)
+            if "image" in request.data and storage_name(user_account.image):
+                schedule_thumbnail(user_account)
 
             return Response(
                 {"message": "Profile updated successfully"}, status=status.HTTP_200_OK
@@ -178,6 +215,9 @@ class UpdateProfileView(APIView):
                 {"error": "User account not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        except ValidationError as error:
+            return Response({"error": error.detail}, status=status.HTTP_400_BAD_REQUEST)
+
         except:
             return Response(
                 {"error": "Something Went Wrong "}, status=status.HTTP_400_BAD_REQUEST
@@ -192,7 +232,9 @@ class ChangePasswordView(APIView):
         current_password = request.data.get("current_password")
         new_password = request.data.get("new_password")
 
-        if not user.check_password(current_password):
+        # Verified without the rehash-on-success setter, since the password is
+        # replaced (and hashed with the current settings) right after.
+        if not check_password(current_password, user.password):
             return Response(
                 {"error": "Current password is incorrect."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -206,6 +248,7 @@ class ChangePasswordView(APIView):
 
         user.set_password(new_password)
         user.save()
+        invalidate_token(request.auth)
 
         return Response(
             {"message": "Password changed successfully."}, status=status.HTTP_200_OK
@@ -213,59 +256,106 @@ class ChangePasswordView(APIView):
 
 
 class AddFavorite(APIView):
-    def post(self, request, ad_id):
-        try:
-            user = request.user
-            advertisement = Advertisement.objects.get(id=ad_id)
-            user_account = UserAccount.objects.get(user=user)
-            # print(advertisement, user_account)
-
-            if advertisement in user_account.favourites.all():
-                # print(advertisement)
-                return Response(
-                    {"message": "Advertisement Already in Favorites."},
-                    status=status.HTTP_208_ALREADY_REPORTED,
-                )
-            else:
-                user_account.favourites.add(advertisement)
-                return Response(
-                    {"message": "Advertisement added to favorites."},
-                    status=status.HTTP_200_OK,
-                )
+    permission_classes = [IsAuthenticated]
 
-        except Advertisement.DoesNotExist:
+    def post(self, request, ad_id):
+        if not Advertisement.objects.filter(id=ad_id).exists():
             return Response(
                 {"error": "Advertisement not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
+        _, created = Favourite.objects.get_or_create(
+            useraccount=request.user.account, advertisement_id=ad_id
+        )
+        if not created:
+            return Response(
+                {"message": "Advertisement Already in Favorites."},
+                status=status.HTTP_208_ALREADY_REPORTED,
+            )
+        favourites_changed(request.user)
+        return Response(
+            {"message": "Advertisement added to favorites."},
+            status=status.HTTP_200_OK,
+        )
+
 
 class RemoveFavorite(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, ad_id):
-        user = request.user
         try:
-            advertisement = Advertisement.objects.get(id=ad_id)
-            user_account = UserAccount.objects.get(user=user)
-
-            if advertisement in user_account.favourites.all():
-                user_account.favourites.remove(advertisement)
-
-                return Response(
-                    {"message": "Advertisement removed from favorites."},
-                    status=status.HTTP_200_OK,
-                )
-            else:
-                return Response(
-                    {"message": "Advertisement not in favorites."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            deleted, _ = Favourite.objects.filter(
+                useraccount=request.user.account, advertisement_id=ad_id
+            ).delete()
+        except UserAccount.DoesNotExist:
+            return Response(
+                {"error": "User account not found."}, status=status.HTTP_404_NOT_FOUND
+            )
 
-        except Advertisement.DoesNotExist:
+        if deleted:
+            favourites_changed(request.user)
             return Response(
-                {"error": "Advertisement not found."}, status=status.HTTP_404_NOT_FOUND
+                {"message": "Advertisement removed from favorites."},
+                status=status.HTTP_200_OK,
             )
-        except UserAccount.DoesNotExist:
+        if not Advertisement.objects.filter(id=ad_id).exists():
             return Response(
-                {"error": "User account not found."}, status=status.HTTP_404_NOT_FOUND
+                {"error": "Advertisement not found."}, status=status.HTTP_404_NOT_FOUND
             )
+        return Response(
+            {"message": "Advertisement not in favorites."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class FavoritesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"ids": self.get_ids(request.user.account)})
+
+    def post(self, request):
+        serializer = FavouritesBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_account = request.user.account
+        with transaction.atomic():
+            self.add(user_account, serializer.validated_data["add"])
+            Favourite.objects.filter(
+                useraccount=user_account,
+                advertisement_id__in=serializer.validated_data["remove"],
+            ).delete()
+            favourites_changed(request.user)
+        return Response({"ids": self.get_ids(user_account)})
+
+    def put(self, request):
+        serializer = FavouritesSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_account = request.user.account
+        ids = serializer.validated_data["ids"]
+        with transaction.atomic():
+            Favourite.objects.filter(useraccount=user_account).exclude(
+                advertisement_id__in=ids
+            ).delete()
+            self.add(user_account, ids)
+            favourites_changed(request.user)
+        return Response({"ids": self.get_ids(user_account)})
+
+    def add(self, user_account, ids):
+        # Unknown advertisements are skipped, existing rows are ignored by the
+        # through table's unique constraint.
+        Favourite.objects.bulk_create(
+            [
+                Favourite(useraccount=user_account, advertisement_id=advertisement_id)
+                for advertisement_id in Advertisement.objects.filter(
+                    id__in=ids
+                ).values_list("id", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+
+    def get_ids(self, user_account):
+        return list(
+            Favourite.objects.filter(useraccount=user_account)
+            .order_by("advertisement_id")
+            .values_list("advertisement_id", flat=True)
+        )
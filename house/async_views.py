@@ -0,0 +1,147 @@
+import base64
+import binascii
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.utils.urls import replace_query_param
+
+from account.authentication import CachedTokenAuthentication
+
+from . import caching, models, serializers
+from .renderers import FastJSONRenderer
+from .views import annotate_is_favourite
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        FastJSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def async_api_view(view):
+    # Plain async Django views bypass DRF, so authentication and error
+    # responses are handled here in the same shape DRF would produce.
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return json_response(
+                {"detail": f'Method "{request.method}" not allowed.'}, status=405
+            )
+        try:
+            result = await CachedTokenAuthentication().aauthenticate(request)
+            request.user = result[0] if result else AnonymousUser()
+            return await view(request, *args, **kwargs)
+        except exceptions.APIException as error:
+            return json_response({"detail": error.detail}, status=error.status_code)
+
+    return wrapper
+
+
+def field_selection(request, compact=False):
+    return {
+        "fields": request.GET.get("fields"),
+        "expand": request.GET.get("expand"),
+        "compact": compact,
+    }
+
+
+async def keyset_page(request, queryset):
+    # Same (-created_at, -id) ordering as CreatedAtCursorPagination, with the
+    # position of the last row as the cursor.
+    try:
+        page_size = min(int(request.GET["page_size"]), MAX_PAGE_SIZE)
+    except (KeyError, ValueError):
+        page_size = PAGE_SIZE
+    page_size = max(page_size, 1)
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            created_at, _, pk = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+            )
+            created_at, pk = datetime.fromisoformat(created_at), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise exceptions.NotFound("Invalid cursor")
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    rows = [
+        row async for row in queryset.order_by("-created_at", "-id")[: page_size + 1]
+    ]
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        position = f"{rows[-1].created_at.isoformat()}|{rows[-1].id}"
+        next_url = replace_query_param(
+            request.build_absolute_uri(),
+            "cursor",
+            base64.urlsafe_b64encode(position.encode()).decode(),
+        )
+    return rows, next_url
+
+
+@async_api_view
+async def advertisement_list(request):
+    selection = field_selection(request, compact=True)
+    serializer_class = serializers.AdvertisementListSerializer
+    queryset = annotate_is_favourite(
+        models.Advertisement.objects.filter(is_approved=True, is_rented=False),
+        request.user,
+    )
+    category = request.GET.get("category") or request.GET.get("house__category")
+    if category:
+        queryset = queryset.filter(house__category__id=category)
+    queryset = serializer_class(**selection).setup_queryset(
+        queryset, keep=["created_at"]
+    )
+
+    rows, next_url = await keyset_page(request, queryset)
+    results = serializer_class(rows, many=True, **selection).data
+    return json_response({"next": next_url, "results": results})
+
+
+@async_api_view
+async def advertisement_detail(request, pk):
+    selection = field_selection(request)
+    serializer_class = serializers.AdvertisementSerializer
+    queryset = serializer_class(**selection).setup_queryset(
+        models.Advertisement.objects.filter(is_approved=True, is_rented=False)
+    )
+    try:
+        advertisement = await queryset.aget(pk=pk)
+    except models.Advertisement.DoesNotExist:
+        raise exceptions.NotFound()
+    return json_response(serializer_class(advertisement, **selection).data)
+
+
+@async_api_view
+async def category_list(request):
+    _, categories = await sync_to_async(caching.get_category_catalogue)()
+    return json_response(serializers.CategorySerializer(categories, many=True).data)
+
+
+@async_api_view
+async def review_list(request):
+    selection = field_selection(request, compact=True)
+    serializer_class = serializers.ReviewSerializer
+    queryset = models.Review.objects.all()
+    advertisement_id = request.GET.get("advertisement")
+    if advertisement_id:
+        queryset = queryset.filter(advertisement=advertisement_id)
+    queryset = serializer_class(**selection).setup_queryset(
+        queryset, keep=["created_at"]
+    )
+
+    rows, next_url = await keyset_page(request, queryset)
+    results = serializer_class(rows, many=True, **selection).data
+    return json_response({"next": next_url, "results": results})
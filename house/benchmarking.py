@@ -0,0 +1,25 @@
+from contextlib import contextmanager
+
+from django.test.utils import setup_databases, teardown_databases
+
+
+def add_database_arguments(parser):
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the benchmark database between runs so --no-seed can reuse it.",
+    )
+
+
+@contextmanager
+def throwaway_database(keepdb=False):
+    # Benchmarks seed rows (and benchmark_indexes drops indexes), so they run
+    # against a test database created next to the configured one, never the
+    # configured database itself.
+    old_config = setup_databases(
+        verbosity=0, interactive=False, keepdb=keepdb, aliases={"default"}
+    )
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=keepdb)
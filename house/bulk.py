@@ -0,0 +1,148 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework import serializers
+
+from .images import (
+    ImageReferenceField,
+    save_image,
+    schedule_thumbnail,
+    storage_name,
+)
+from .models import Category, House
+
+EXPORT_FIELDS = ["id", "title", "description", "location", "image", "price"]
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class HouseImportSerializer(serializers.ModelSerializer):
+    category_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+    image = ImageReferenceField(prefix="house")
+
+    class Meta:
+        model = House
+        fields = ["title", "description", "location", "image", "price", "category_ids"]
+
+    def validate_category_ids(self, value):
+        unknown = set(value) - self.context["category_ids"]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown categories: {', '.join(map(str, sorted(unknown)))}."
+            )
+        return list(dict.fromkeys(value))
+
+
+def detect_format(name):
+    for extension, file_format in IMPORT_FORMATS.items():
+        if name.lower().endswith(extension):
+            return file_format
+    return None
+
+
+def read_rows(lines, file_format):
+    # ``lines`` is any iterable of text lines, so uploads and files on disk are
+    # both read incrementally.
+    if file_format == "csv":
+        for row in csv.DictReader(lines):
+            if row.get("category_ids"):
+                row["category_ids"] = row["category_ids"].replace(";", ",").split(",")
+            else:
+                row.pop("category_ids", None)
+            yield row
+    else:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {}
+
+
+def decode_lines(stream):
+    return codecs.iterdecode(stream, "utf-8-sig")
+
+
+def is_parseable(stream, file_format):
+    # Rows are written chunk by chunk, so a decoding or CSV error part-way
+    # through must be found before the first chunk is committed.
+    try:
+        for _ in read_rows(decode_lines(stream), file_format):
+            pass
+    except (UnicodeDecodeError, csv.Error):
+        return False
+    finally:
+        stream.seek(0)
+    return True
+
+
+def import_houses(rows, owner, chunk_size=500):
+    # Categories are checked against one set instead of a query per row.
+    context = {"category_ids": set(Category.objects.values_list("id", flat=True))}
+    created, errors = 0, []
+    numbered = enumerate(rows, start=1)
+    while chunk := list(islice(numbered, chunk_size)):
+        valid = []
+        for number, row in chunk:
+            serializer = HouseImportSerializer(data=row, context=context)
+            if serializer.is_valid():
+                # Inline images are written as their row is validated, so a
+                # chunk holds image names rather than decoded payloads.
+                row = serializer.validated_data
+                row["image"] = save_image(row["image"])
+                valid.append(row)
+            else:
+                errors.append({"row": number, "errors": serializer.errors})
+        if valid:
+            created += _create_houses(valid, owner)
+    return {"created": created, "errors": errors}
+
+
+def _create_houses(rows, owner):
+    houses = [
+        House(owner=owner, **{k: v for k, v in row.items() if k != "category_ids"})
+        for row in rows
+    ]
+    with transaction.atomic():
+        House.objects.bulk_create(houses)
+        House.category.through.objects.bulk_create(
+            House.category.through(house_id=house.pk, category_id=category_id)
+            for house, row in zip(houses, rows)
+            for category_id in row["category_ids"]
+        )
+        for house in houses:
+            if storage_name(house.image):
+                schedule_thumbnail(house)
+    return len(houses)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def export_houses(queryset, file_format, chunk_size=2000):
+    queryset = (
+        queryset.only(*EXPORT_FIELDS)
+        .prefetch_related("category")
+        .order_by("id")
+        .iterator(chunk_size=chunk_size)
+    )
+    writer = csv.writer(_Echo())
+    if file_format == "csv":
+        yield writer.writerow([*EXPORT_FIELDS, "category_ids"])
+    for house in queryset:
+        values = [getattr(house, field) for field in EXPORT_FIELDS]
+        category_ids = [category.id for category in house.category.all()]
+        if file_format == "csv":
+            yield writer.writerow([*values, ";".join(map(str, category_ids))])
+        else:
+            row = {**dict(zip(EXPORT_FIELDS, values)), "category_ids": category_ids}
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
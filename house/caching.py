@@ -0,0 +1,99 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category
+
+GENERATION_KEY = "advertisement-list:generation"
+HITS_KEY = "advertisement-list:hits"
+MISSES_KEY = "advertisement-list:misses"
+CATEGORY_GENERATION_KEY = "category-catalogue:generation"
+
+# (generation, loaded at, categories)
+_category_catalogue = (None, 0, [])
+
+
+def get_generation(key=GENERATION_KEY):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_advertisement_list():
+    # A new generation orphans every cached page at once; the old entries age
+    # out of the LRU (or expire) on their own.
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, time.time_ns(), None))
+
+
+def advertisement_list_key(request):
+    params = sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values
+    )
+    # The renderer is part of the key because cached pages carry their ETag.
+    params.append(request.accepted_renderer.format)
+    digest = hashlib.md5(repr(params).encode()).hexdigest()
+    return f"advertisement-list:{get_generation()}:{digest}"
+
+
+def get_cached_advertisement_list(key):
+    data = cache.get(key)
+    _increment(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_cached_advertisement_list(key, data):
+    cache.set(key, data, settings.ADVERTISEMENT_LIST_CACHE_TIMEOUT)
+
+
+def get_advertisement_list_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {"hits": stats.get(HITS_KEY, 0), "misses": stats.get(MISSES_KEY, 0)}
+
+
+def _increment(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_category_catalogue():
+    # Categories change rarely, so each process keeps its own copy and reads
+    # the generation to learn that it has gone stale. The generation is only
+    # shared between processes with a shared cache backend; with the default
+    # locmem cache another worker's change is picked up once the copy is
+    # CATEGORY_CATALOGUE_MAX_AGE seconds old. The returned version includes
+    # the load time so a rebuilt copy never reuses an older version's ETag.
+    global _category_catalogue
+    generation = get_generation(CATEGORY_GENERATION_KEY)
+    cached_generation, loaded_at, categories = _category_catalogue
+    now = time.monotonic_ns()
+    if (
+        cached_generation != generation
+        or now - loaded_at > settings.CATEGORY_CATALOGUE_MAX_AGE * 1_000_000_000
+    ):
+        categories = list(Category.objects.order_by("id"))
+        _category_catalogue = (generation, now, categories)
+    return f"{generation}.{_category_catalogue[1]}", categories
+
+
+def invalidate_category_catalogue():
+    transaction.on_commit(
+        lambda: cache.set(CATEGORY_GENERATION_KEY, time.time_ns(), None)
+    )
+
+
+def refresh_category_counts(categories):
+    # Recount once the writer has committed, so the count sees its changes
+    # and those of any transaction that committed before it.
+    def refresh():
+        categories.refresh_advertisement_counts()
+        cache.set(CATEGORY_GENERATION_KEY, time.time_ns(), None)
+
+    transaction.on_commit(refresh)
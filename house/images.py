@@ -0,0 +1,156 @@
+import base64
+import binascii
+import io
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
+from django.core.validators import URLValidator
+from django.db import connection, transaction
+from PIL import Image, UnidentifiedImageError
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+_url_validator = URLValidator(schemes=["http", "https"])
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_THUMBNAIL_WORKERS, thread_name_prefix="thumbnails"
+)
+
+
+def is_inline_image(value):
+    return isinstance(value, str) and value.startswith("data:")
+
+
+class PendingImage:
+    # A validated upload that is only written to the storage by save_image(),
+    # once the rest of the data has been validated too, so a rejected request
+    # leaves no orphaned file behind.
+    def __init__(self, content, extension, prefix):
+        self.content = content
+        self.extension = extension
+        self.prefix = prefix
+
+    def save(self):
+        name = default_storage.save(
+            f"{self.prefix}/{uuid.uuid4().hex}.{self.extension}",
+            ContentFile(self.content),
+        )
+        return default_storage.url(name)
+
+
+def validate_image(value, prefix):
+    # Uploads become a PendingImage; URLs of images hosted elsewhere or
+    # already in the storage are kept as they are.
+    if isinstance(value, File):
+        if value.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError("Image file is too large.")
+        content = value.read()
+    elif is_inline_image(value):
+        try:
+            content = base64.b64decode(value.partition(",")[2], validate=True)
+        except (binascii.Error, ValueError):
+            raise serializers.ValidationError("Invalid base64 image.")
+    else:
+        return validate_image_url(value)
+
+    if len(content) > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise serializers.ValidationError("Image file is too large.")
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            extension = image.format.lower()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise serializers.ValidationError("Upload a valid image.")
+    return PendingImage(content, extension, prefix)
+
+
+def validate_image_url(value):
+    if not isinstance(value, str) or len(value) > settings.IMAGE_URL_MAX_LENGTH:
+        raise serializers.ValidationError("Enter an image URL or upload an image.")
+    if storage_name(value) is not None:
+        return value
+    try:
+        _url_validator(value)
+    except DjangoValidationError:
+        raise serializers.ValidationError("Enter an image URL or upload an image.")
+    return value
+
+
+def save_image(value):
+    return value.save() if isinstance(value, PendingImage) else value
+
+
+def store_image(value, prefix):
+    return save_image(validate_image(value, prefix))
+
+
+def storage_name(url):
+    base_url = default_storage.url("")
+    if url and base_url and url.startswith(base_url) and ".." not in url:
+        return url[len(base_url) :]
+    return None
+
+
+def schedule_thumbnail(instance):
+    model, pk = type(instance), instance.pk
+
+    def submit():
+        if settings.IMAGE_THUMBNAIL_ASYNC:
+            _executor.submit(_generate_thumbnail_task, model, pk)
+        else:
+            generate_thumbnail(model, pk)
+
+    transaction.on_commit(submit)
+
+
+def generate_thumbnail(model, pk):
+    instance = model.objects.filter(pk=pk).first()
+    name = storage_name(instance.image) if instance else None
+    if name is None or not default_storage.exists(name):
+        return
+
+    with default_storage.open(name) as source, Image.open(source) as image:
+        image.thumbnail(settings.IMAGE_THUMBNAIL_SIZE)
+        output = io.BytesIO()
+        image.convert("RGB").save(output, format="JPEG", quality=85)
+
+    directory, filename = os.path.split(name)
+    thumbnail = default_storage.save(
+        f"{directory}/thumbnails/{os.path.splitext(filename)[0]}.jpg",
+        ContentFile(output.getvalue()),
+    )
+    instance.image_thumbnail = default_storage.url(thumbnail)
+    instance.save(
+        update_fields=[
+            field.name
+            for field in model._meta.concrete_fields
+            if field.name in ("image_thumbnail", "updated_at")
+        ]
+    )
+
+
+def _generate_thumbnail_task(model, pk):
+    try:
+        generate_thumbnail(model, pk)
+    except Exception:
+        logger.exception("Thumbnail generation failed for %s %s", model.__name__, pk)
+    finally:
+        connection.close()
+
+
+class ImageReferenceField(serializers.CharField):
+    def __init__(self, prefix, **kwargs):
+        self.prefix = prefix
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        # Returns a PendingImage for uploads, see save_image().
+        if not isinstance(data, File):
+            data = super().to_internal_value(data)
+        return validate_image(data, self.prefix)
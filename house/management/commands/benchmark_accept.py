@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import Count, Q
+from django.test import Client
+from rest_framework.authtoken.models import Token
+
+from account.models import UserAccount
+from house import benchmarking
+from house.models import Advertisement, Category, House, RentRequest
+
+
+class Command(BaseCommand):
+    help = (
+        "Accept competing rent requests for the same advertisements from "
+        "concurrent threads and report the accept throughput, checking that "
+        "each advertisement was accepted exactly once. Runs against a "
+        "throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--advertisements", type=int, default=20)
+        parser.add_argument(
+            "--requests", type=int, default=8, help="Rent requests per advertisement."
+        )
+        parser.add_argument("--threads", type=int, default=8)
+        benchmarking.add_database_arguments(parser)
+
+    def handle(self, *args, **options):
+        with benchmarking.throwaway_database(options["keepdb"]):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        owner = self.create_account("benchmark-accept-owner")
+        tenants = [
+            self.create_account(f"benchmark-accept-tenant-{number}")
+            for number in range(options["requests"])
+        ]
+        category, _ = Category.objects.get_or_create(
+            slug="benchmark", defaults={"name": "Benchmark"}
+        )
+        advertisement_ids, rent_request_ids = [], []
+        for _ in range(options["advertisements"]):
+            house = House.objects.create(
+                owner=owner,
+                title="Benchmark",
+                description="Benchmark",
+                location="Dhaka",
+                image="https://example.com/house.jpg",
+                price="1000.00",
+                is_advertised=True,
+            )
+            house.category.add(category)
+            advertisement = Advertisement.objects.create(house=house, is_approved=True)
+            advertisement_ids.append(advertisement.id)
+            rent_request_ids += [
+                RentRequest.objects.create(
+                    advertisement=advertisement, requested_by=tenant
+                ).id
+                for tenant in tenants
+            ]
+
+        # Requests for the same advertisement are adjacent, so the threads
+        # compete for the same row lock.
+        token = Token.objects.get_or_create(user=owner.user)[0].key
+        retries = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            statuses = list(
+                executor.map(
+                    lambda pk: self.accept(token, pk, retries), rent_request_ids
+                )
+            )
+        elapsed = time.perf_counter() - started
+
+        # The throughput only counts if every advertisement has one winner.
+        miscounted = sorted(
+            Advertisement.objects.filter(id__in=advertisement_ids)
+            .annotate(
+                accepted=Count(
+                    "rent_request", filter=Q(rent_request__status="ACCEPTED")
+                )
+            )
+            .exclude(accepted=1)
+            .values_list("id", flat=True)
+        )
+        if miscounted or statuses.count(200) != len(advertisement_ids):
+            raise CommandError(
+                f"Advertisements not accepted exactly once: {miscounted}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(statuses)} accepts for {len(advertisement_ids)} advertisements "
+                f"on {options['threads']} threads in {elapsed:.2f} s, "
+                f"{len(statuses) / elapsed:.0f} requests/s, "
+                f"{len(retries)} lock retries."
+            )
+        )
+
+    def create_account(self, username):
+        user, _ = User.objects.get_or_create(username=username)
+        account, _ = UserAccount.objects.get_or_create(
+            user=user, defaults={"address": "Dhaka"}
+        )
+        return account
+
+    def accept(self, token, rent_request_id, retries, timeout=30):
+        client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    return client.post(
+                        f"/house/accept-rent-request/{rent_request_id}/"
+                    ).status_code
+                except OperationalError:
+                    # SQLite reports lock contention instead of waiting on
+                    # some COMMITs; accepting is idempotent, so it is retried.
+                    if time.monotonic() > deadline:
+                        raise
+                    retries.append(rent_request_id)
+                    time.sleep(0.01)
+        finally:
+            connection.close()
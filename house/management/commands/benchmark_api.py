@@ -0,0 +1,170 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+from rest_framework.authtoken.models import Token
+
+import account.urls
+import house.urls
+from account.models import UserAccount
+from house import benchmarking
+from house.seeding import seed_dataset
+
+# GET endpoints outside the routers.
+ACCOUNT_ENDPOINTS = ["user_info", "favorites"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every router endpoint of the house and account apps, plus the "
+        "account profile endpoints, through the test client and record p50/p95 "
+        "latency and query counts. Compare them against a JSON baseline and fail "
+        "when an endpoint regresses beyond the threshold. Runs against a "
+        "throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20)
+        parser.add_argument(
+            "--baseline",
+            default=str(Path(settings.BASE_DIR) / "api_baseline.json"),
+        )
+        parser.add_argument(
+            "--save", action="store_true", help="Write the results as the baseline."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.5,
+            help="Allowed p95 slowdown relative to the baseline, 0.5 = 50%%.",
+        )
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--houses", type=int, default=500)
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Reuse previously seeded rows."
+        )
+        benchmarking.add_database_arguments(parser)
+
+    def handle(self, *args, **options):
+        with benchmarking.throwaway_database(options["keepdb"]):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        if not options["no_seed"]:
+            seed_dataset(users=options["users"], houses=options["houses"], seed=0)
+
+        # A staff account reaches the moderation endpoints as well.
+        user, _ = User.objects.get_or_create(
+            username="benchmark-api", defaults={"is_staff": True}
+        )
+        UserAccount.objects.get_or_create(
+            user=user, defaults={"account_type": "Admin", "address": "Dhaka"}
+        )
+        client = Client(
+            HTTP_AUTHORIZATION=f"Token {Token.objects.get_or_create(user=user)[0].key}",
+            raise_request_exception=False,
+        )
+
+        results = {}
+        for name, url in self.get_endpoints(client):
+            results[name] = self.measure(client, url, options["requests"])
+            self.stdout.write(
+                f"{name:<45} p50 {results[name]['p50_ms']:8.2f} ms  "
+                f"p95 {results[name]['p95_ms']:8.2f} ms  "
+                f"{results[name]['queries']:3d} queries"
+            )
+
+        baseline_path = Path(options["baseline"])
+        if options["save"]:
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(
+                self.style.SUCCESS(f"Baseline written to {baseline_path}.")
+            )
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}, run with --save.")
+            return
+
+        regressions = self.compare(
+            json.loads(baseline_path.read_text()), results, options["threshold"]
+        )
+        if regressions:
+            raise CommandError("Regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def get_endpoints(self, client):
+        for prefix, viewset, basename in [
+            *house.urls.router.registry,
+            *account.urls.router.registry,
+        ]:
+            try:
+                list_url = reverse(f"{basename}-list")
+            except NoReverseMatch:
+                continue
+            response = client.get(list_url)
+            if response.status_code != 200:
+                self.stdout.write(
+                    f"Skipping {prefix}: list returned {response.status_code}."
+                )
+                continue
+            yield f"{basename}-list", list_url
+
+            data = response.json()
+            rows = data.get("results", []) if isinstance(data, dict) else data
+            if rows and "id" in rows[0]:
+                try:
+                    yield f"{basename}-detail", reverse(
+                        f"{basename}-detail", args=[rows[0]["id"]]
+                    )
+                except NoReverseMatch:
+                    pass
+        for name in ACCOUNT_ENDPOINTS:
+            yield name, reverse(name)
+
+    def measure(self, client, url, requests):
+        # The query log is a bounded deque; once full its length stops changing.
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"{url} returned {response.status_code}.")
+
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return {
+            "p50_ms": round(statistics.median(timings) * 1000, 3),
+            "p95_ms": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3),
+            "queries": len(queries),
+        }
+
+    def compare(self, baseline, results, threshold):
+        regressions = []
+        for name, result in sorted(results.items()):
+            expected = baseline.get(name)
+            if expected is None:
+                continue
+            if result["queries"] > expected["queries"]:
+                regressions.append(
+                    f"{name}: {result['queries']} queries, baseline {expected['queries']}"
+                )
+            # A millisecond of slack keeps sub-millisecond endpoints from
+            # failing on timer noise.
+            allowed = expected["p95_ms"] * (1 + threshold) + 1
+            if result["p95_ms"] > allowed:
+                regressions.append(
+                    f"{name}: p95 {result['p95_ms']:.2f} ms, "
+                    f"baseline {expected['p95_ms']:.2f} ms"
+                )
+        return regressions
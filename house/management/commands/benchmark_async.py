@@ -0,0 +1,129 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+SYNC_URL = "/house/advertisements/list/"
+ASYNC_URL = "/house/async/advertisements/"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and latency of the synchronous advertisement list "
+        "served by a thread pool against the async list served through the "
+        "ASGI application under the same number of concurrent requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument(
+            "--db-latency",
+            type=float,
+            default=0,
+            help="Milliseconds added to every query to simulate a remote database.",
+        )
+
+    def handle(self, *args, **options):
+        if options["db_latency"]:
+            self.delay_queries(options["db_latency"] / 1000)
+
+        query = f"page_size={options['page_size']}"
+        results = {
+            "sync": self.run_sync(
+                f"{SYNC_URL}?{query}", options["requests"], options["concurrency"]
+            ),
+            "async": asyncio.run(
+                self.run_async(
+                    ASYNC_URL, query, options["requests"], options["concurrency"]
+                )
+            ),
+        }
+        for name, (elapsed, timings) in results.items():
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f"  {len(timings) / elapsed:.1f} requests/s")
+            self.stdout.write(
+                f"  p50 {statistics.median(timings) * 1000:.1f} ms, "
+                f"p95 {p95 * 1000:.1f} ms"
+            )
+
+    def delay_queries(self, seconds):
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        connection_created.connect(install, weak=False)
+        connections.close_all()
+
+    def run_sync(self, url, requests, concurrency):
+        def fetch(_):
+            started = time.perf_counter()
+            response = Client().get(url)
+            if response.status_code != 200:
+                raise CommandError(f"{url} returned {response.status_code}.")
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = list(pool.map(fetch, range(requests)))
+        return time.perf_counter() - started, timings
+
+    async def run_async(self, path, query, requests, concurrency):
+        application = get_asgi_application()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with semaphore:
+                started = time.perf_counter()
+                status = await self.asgi_get(application, path, query)
+                if status != 200:
+                    raise CommandError(f"{path} returned {status}.")
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        timings = await asyncio.gather(*(fetch() for _ in range(requests)))
+        return time.perf_counter() - started, timings
+
+    async def asgi_get(self, application, path, query):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost")],
+            "server": ("localhost", 80),
+            "client": ("127.0.0.1", 0),
+        }
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        disconnected = asyncio.Event()
+        status = None
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await application(scope, receive, send)
+        disconnected.set()
+        return status
@@ -0,0 +1,153 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from account.models import UserAccount
+from house import benchmarking
+from house.models import Advertisement, Category, House, RentRequest
+
+INDEX_NAMES = {
+    Advertisement: ["advertisement_status_idx", "advertisement_active_idx"],
+    RentRequest: ["rent_request_status_idx"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed advertisements and rent requests, then report EXPLAIN plans and "
+        "latency of the listing filters without and with their indexes. Runs "
+        "against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Reuse previously seeded rows."
+        )
+        benchmarking.add_database_arguments(parser)
+
+    def handle(self, *args, **options):
+        with benchmarking.throwaway_database(options["keepdb"]):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        if not options["no_seed"]:
+            self.seed(options["rows"], options["batch_size"])
+
+        queries = self.get_queries()
+        self.set_indexes(enabled=False)
+        try:
+            before = self.measure(queries, options["repeat"])
+        finally:
+            self.set_indexes(enabled=True)
+        after = self.measure(queries, options["repeat"])
+
+        for name in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, results in (("before", before), ("after", after)):
+                plan, latency = results[name]
+                self.stdout.write(f"  {label}: {latency * 1000:.2f} ms (median)")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def seed(self, rows, batch_size):
+        owners = []
+        for number in range(10):
+            user, _ = User.objects.get_or_create(username=f"benchmark-owner-{number}")
+            account, _ = UserAccount.objects.get_or_create(user=user)
+            owners.append(account)
+        categories = [
+            Category.objects.get_or_create(slug=slug, defaults={"name": slug})[0]
+            for slug in ("flat", "duplex", "studio", "villa")
+        ]
+
+        for start in range(0, rows, batch_size):
+            size = min(batch_size, rows - start)
+            with transaction.atomic():
+                houses = House.objects.bulk_create(
+                    House(
+                        owner=random.choice(owners),
+                        title=f"House {start + offset}",
+                        description="Seeded for benchmarking.",
+                        location="Dhaka",
+                        image="",
+                        price=random.randint(5_000, 100_000),
+                        is_advertised=True,
+                    )
+                    for offset in range(size)
+                )
+                House.category.through.objects.bulk_create(
+                    House.category.through(
+                        house_id=house.id, category_id=random.choice(categories).id
+                    )
+                    for house in houses
+                )
+                advertisements = Advertisement.objects.bulk_create(
+                    Advertisement(
+                        house=house,
+                        is_approved=random.random() < 0.8,
+                        is_rented=random.random() < 0.5,
+                    )
+                    for house in houses
+                )
+                RentRequest.objects.bulk_create(
+                    RentRequest(
+                        advertisement=advertisement,
+                        requested_by=random.choice(owners),
+                        status=random.choice(["PENDING", "ACCEPTED", "REJECTED"]),
+                    )
+                    for advertisement in advertisements
+                )
+            self.stdout.write(f"Seeded {start + size}/{rows} advertisements")
+
+    def get_queries(self):
+        advertisement = Advertisement.objects.order_by("?").first()
+        category = Category.objects.first()
+        owner = advertisement.house.owner
+        return {
+            "advertisement listing": Advertisement.objects.filter(
+                is_approved=True, is_rented=False, house__category=category
+            ).order_by("-created_at", "-id")[:20],
+            "favourite advertisements": Advertisement.objects.filter(
+                is_approved=True
+            ).order_by("-created_at", "-id")[:20],
+            "owner rent requests": RentRequest.objects.filter(
+                advertisement__house__owner=owner
+            ).order_by("-created_at", "-id")[:20],
+            "pending requests of an advertisement": RentRequest.objects.filter(
+                advertisement=advertisement, status="PENDING"
+            ),
+            "existing request of a user": RentRequest.objects.filter(
+                advertisement=advertisement, requested_by=owner
+            ),
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            results[name] = (queryset.explain(), statistics.median(timings))
+        return results
+
+    def set_indexes(self, enabled):
+        with connection.schema_editor() as editor:
+            for model, names in INDEX_NAMES.items():
+                for index in model._meta.indexes:
+                    if index.name not in names:
+                        continue
+                    if enabled:
+                        editor.add_index(model, index)
+                    else:
+                        editor.remove_index(model, index)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
@@ -0,0 +1,112 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from rest_framework.authtoken.models import Token
+
+from account.models import UserAccount
+from house import benchmarking
+from house.models import Advertisement, Category, House
+
+ENDPOINTS = {
+    "advertisement list": "/house/advertisements/list/",
+    "house list": "/house/list/",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec of the advertisement and house list endpoints "
+        "with the stock DRF serializer and renderer against the compiled "
+        "serializer plans and the fast JSON renderer, and check that both "
+        "produce byte-identical responses. Runs against a throwaway test "
+        "database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Reuse previously seeded rows."
+        )
+        benchmarking.add_database_arguments(parser)
+
+    def handle(self, *args, **options):
+        with benchmarking.throwaway_database(options["keepdb"]):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        owner = self.get_owner()
+        if not options["no_seed"]:
+            self.seed(owner, options["rows"])
+
+        client = Client(
+            HTTP_AUTHORIZATION=f"Token {Token.objects.get_or_create(user=owner.user)[0].key}"
+        )
+        params = {"page_size": options["page_size"]}
+        for name, url in ENDPOINTS.items():
+            with override_settings(SERIALIZER_PLANS=False, FAST_JSON_RENDERER=False):
+                stock, stock_rate = self.measure(
+                    client, url, params, options["requests"]
+                )
+            fast, fast_rate = self.measure(client, url, params, options["requests"])
+            if stock != fast:
+                raise CommandError(f"{name}: responses differ between both paths.")
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f"  stock: {stock_rate:.1f} requests/s")
+            self.stdout.write(
+                f"  fast:  {fast_rate:.1f} requests/s ({fast_rate / stock_rate:.2f}x), "
+                f"{len(fast)} identical bytes"
+            )
+
+    def get_owner(self):
+        user, _ = User.objects.get_or_create(username="benchmark-serializers")
+        return UserAccount.objects.get_or_create(user=user)[0]
+
+    def seed(self, owner, rows):
+        categories = [
+            Category.objects.get_or_create(slug=slug, defaults={"name": slug})[0]
+            for slug in ("flat", "duplex", "studio")
+        ]
+        houses = House.objects.bulk_create(
+            House(
+                owner=owner,
+                title=f"House {number}",
+                description="Seeded for benchmarking. " * 20,
+                location="Dhaka",
+                image="https://example.com/house.jpg",
+                price=10_000 + number,
+                is_advertised=True,
+            )
+            for number in range(rows)
+        )
+        House.category.through.objects.bulk_create(
+            House.category.through(house_id=house.id, category_id=category.id)
+            for house in houses
+            for category in categories[: house.id % len(categories) + 1]
+        )
+        Advertisement.objects.bulk_create(
+            Advertisement(
+                house=house,
+                is_approved=True,
+                review_count=3,
+                rating_avg=4.0,
+                rating_histogram={"3": 1, "4": 1, "5": 1},
+            )
+            for house in houses
+        )
+
+    def measure(self, client, url, params, requests):
+        timings, content = [], None
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url, params)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise CommandError(f"{url} returned {response.status_code}.")
+            content = response.content
+        return content, 1 / statistics.median(timings)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from rest_framework.exceptions import ValidationError
+
+from account.models import UserAccount
+from house.images import generate_thumbnail, store_image
+from house.models import House
+
+
+class Command(BaseCommand):
+    help = (
+        "Move base64 images stored inline on houses and user accounts into the "
+        "file storage, keeping only their URL, and generate thumbnails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        for model, prefix in ((House, "house"), (UserAccount, "account")):
+            self.extract(model, prefix, options["chunk_size"])
+
+    def extract(self, model, prefix, chunk_size):
+        moved = failed = 0
+        queryset = model.objects.filter(image__startswith="data:").only("id", "image")
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            try:
+                url = store_image(instance.image, prefix)
+            except ValidationError as error:
+                failed += 1
+                self.stderr.write(f"{model.__name__} {instance.pk}: {error.detail[0]}")
+                continue
+            model.objects.filter(pk=instance.pk).update(image=url, image_thumbnail="")
+            generate_thumbnail(model, instance.pk)
+            moved += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{model.__name__}: moved {moved} images, {failed} failed."
+            )
+        )
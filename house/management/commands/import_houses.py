@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from account.models import UserAccount
+from house import bulk
+
+
+class Command(BaseCommand):
+    help = "Import houses for one owner from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="Username of the owner.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        file_format = bulk.detect_format(options["path"])
+        if file_format is None:
+            raise CommandError("Only .csv and .jsonl files are supported.")
+        try:
+            owner = UserAccount.objects.get(user__username=options["owner"])
+        except UserAccount.DoesNotExist:
+            raise CommandError(f"No account for user {options['owner']!r}.")
+
+        with open(options["path"], "rb") as stream:
+            if not bulk.is_parseable(stream, file_format):
+                raise CommandError("The file could not be parsed.")
+            result = bulk.import_houses(
+                bulk.read_rows(bulk.decode_lines(stream), file_format),
+                owner,
+                options["chunk_size"],
+            )
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} houses, "
+                f"{len(result['errors'])} rows rejected."
+            )
+        )
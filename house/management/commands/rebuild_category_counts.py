@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from house import caching
+from house.models import Category
+
+
+class Command(BaseCommand):
+    help = "Recompute the active advertisement count of every category."
+
+    def handle(self, *args, **options):
+        updated = Category.objects.refresh_advertisement_counts()
+        caching.invalidate_category_catalogue()
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} categories."))
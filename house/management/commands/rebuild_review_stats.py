@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from house.models import Advertisement
+
+
+class Command(BaseCommand):
+    help = "Recompute the review count, average and histogram of every advertisement."
+
+    def handle(self, *args, **options):
+        updated = 0
+        for pk in Advertisement.objects.values_list("pk", flat=True).iterator():
+            with transaction.atomic():
+                advertisement = Advertisement.objects.select_for_update().get(pk=pk)
+                advertisement.refresh_review_stats()
+                advertisement.save(
+                    update_fields=[*Advertisement.REVIEW_STATS_FIELDS, "updated_at"]
+                )
+            updated += 1
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} advertisements."))
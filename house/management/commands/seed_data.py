@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from house.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users, houses with categories, advertisements, reviews, rent "
+        "requests and favourites with bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--houses", type=int, default=200)
+        parser.add_argument("--reviews-per-advertisement", type=int, default=5)
+        parser.add_argument("--requests-per-advertisement", type=int, default=3)
+        parser.add_argument("--favourites-per-user", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--seed", type=int, help="Random seed for a reproducible dataset."
+        )
+
+    def handle(self, *args, **options):
+        counts = seed_dataset(
+            users=options["users"],
+            houses=options["houses"],
+            reviews_per_advertisement=options["reviews_per_advertisement"],
+            requests_per_advertisement=options["requests_per_advertisement"],
+            favourites_per_user=options["favourites_per_user"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Seeded "
+                + ", ".join(f"{count} {name}" for name, count in counts.items())
+                + "."
+            )
+        )
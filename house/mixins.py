@@ -0,0 +1,269 @@
+import copy
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Prefetch
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import serializers
+
+from rent_ease.metrics import timed
+
+
+def nested_lookups(prefix, lookups):
+    nested = []
+    for lookup in lookups:
+        if isinstance(lookup, Prefetch):
+            lookup = copy.copy(lookup)
+            lookup.add_prefix(prefix)
+        else:
+            lookup = f"{prefix}__{lookup}"
+        nested.append(lookup)
+    return nested
+
+
+class EagerLoadingMixin:
+    select_related_fields = []
+    prefetch_related_fields = []
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+def field_tree(paths):
+    # "id,house.title,house.price" -> {"id": {}, "house": {"title": {}, "price": {}}}
+    if isinstance(paths, str):
+        paths = paths.split(",")
+    tree = {}
+    for path in paths or []:
+        node = tree
+        for name in filter(None, path.strip().split(".")):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    # Default field selection for list responses when ?fields= is not given.
+    compact_fields = None
+    # Nested relations rendered as primary keys in lists unless in ?expand=.
+    expandable_fields = []
+
+    def __init__(self, *args, fields=None, expand=None, compact=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.select_fields(field_tree(fields), field_tree(expand), compact)
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+    def select_fields(self, fields, expand, compact):
+        if not fields and compact and self.compact_fields is not None:
+            fields = field_tree(self.compact_fields)
+        for name, field in list(self.fields.items()):
+            if fields and name not in fields:
+                self.fields.pop(name)
+            elif compact and name in self.expandable_fields and name not in expand:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True,
+                    many=hasattr(field, "child"),
+                    **({} if field.source == name else {"source": field.source}),
+                )
+            elif isinstance(getattr(field, "child", field), SparseFieldsetMixin):
+                getattr(field, "child", field).select_fields(
+                    (fields or {}).get(name), expand.get(name, {}), compact
+                )
+
+    def used_lookup(self, lookup):
+        # The longest prefix of ``lookup`` that the selected fields render.
+        name, _, rest = lookup.partition("__")
+        used = ""
+        for field in self.fields.values():
+            if field.source.split(".")[0] != name:
+                continue
+            child = getattr(field, "child_relation", getattr(field, "child", field))
+            if isinstance(child, SparseFieldsetMixin) and rest:
+                nested = child.used_lookup(rest)
+                used = max(used, f"{name}__{nested}" if nested else name, key=len)
+            elif isinstance(child, serializers.RelatedField):
+                # Primary keys need no join, only the relation itself.
+                used = used or ("" if rest else name)
+            else:
+                return lookup
+        return used
+
+    def deferred_columns(self, joined, prefix=""):
+        sources = {field.source.split(".")[0] for field in self.fields.values()}
+        deferred = [
+            f"{prefix}{field.name}"
+            for field in self.Meta.model._meta.concrete_fields
+            if not field.is_relation
+            and not field.primary_key
+            and field.name not in sources
+        ]
+        for field in self.fields.values():
+            path = f"{prefix}{field.source}"
+            if isinstance(field, SparseFieldsetMixin) and path in joined:
+                deferred += field.deferred_columns(joined, f"{path}__")
+        return deferred
+
+    def setup_queryset(self, queryset, keep=()):
+        # Only join and prefetch what the selected fields render, and leave
+        # unselected columns of the joined models out of the SELECT.
+        select = list(
+            filter(
+                None,
+                map(self.used_lookup, getattr(self, "select_related_fields", [])),
+            )
+        )
+        prefetch = [
+            lookup
+            for lookup in getattr(self, "prefetch_related_fields", [])
+            if self.used_lookup(getattr(lookup, "prefetch_through", lookup))
+            == getattr(lookup, "prefetch_through", lookup)
+        ]
+        joined = {
+            "__".join(lookup.split("__")[: depth + 1])
+            for lookup in select
+            for depth in range(lookup.count("__") + 1)
+        }
+        deferred = [
+            column for column in self.deferred_columns(joined) if column not in keep
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class EagerLoadingViewSetMixin:
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsetMixin):
+            serializer = serializer_class(**self.get_field_selection())
+            ordering = getattr(self.pagination_class, "ordering", ())
+            if isinstance(ordering, str):
+                ordering = [ordering]
+            queryset = serializer.setup_queryset(
+                queryset, keep=[field.lstrip("-") for field in ordering]
+            )
+        elif hasattr(serializer_class, "setup_eager_loading"):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), SparseFieldsetMixin):
+            kwargs = {**self.get_field_selection(), **kwargs}
+        return super().get_serializer(*args, **kwargs)
+
+    def get_field_selection(self):
+        # Field selection only shapes reads; writes always see every field.
+        if self.request is None or self.request.method != "GET":
+            return {}
+        return {
+            "fields": self.request.query_params.get("fields"),
+            "expand": self.request.query_params.get("expand"),
+            "compact": self.action == "list",
+        }
+
+
+class ListSerializerViewSetMixin:
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == "list" and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+
+class ConditionalViewSetMixin:
+    # The updated_at columns the representation depends on, relative to the
+    # queryset's model.
+    conditional_fields = ["updated_at"]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            queryset,
+            lambda: super(ConditionalViewSetMixin, self).list(request, *args, **kwargs),
+            last_modified=False,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            # Malformed lookups are a 404, as they are in get_object().
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        return self.conditional_response(
+            queryset,
+            lambda: super(ConditionalViewSetMixin, self).retrieve(
+                request, *args, **kwargs
+            ),
+        )
+
+    def conditional_response(self, queryset, get_response, last_modified=True):
+        # One aggregate query decides whether the client copy is current, so a
+        # 304 is returned before anything is fetched or serialized.
+        validators = queryset.order_by().aggregate(
+            count=Count("pk", distinct=True),
+            **{
+                f"max_{index}": Max(field)
+                for index, field in enumerate(self.conditional_fields)
+            },
+        )
+        return self.validated_response(validators, get_response, last_modified)
+
+    def validated_response(self, validators, get_response, last_modified=True):
+        # A row leaving a list does not move the newest updated_at, so lists
+        # are validated by their ETag alone, which includes the count.
+        timestamps = [
+            value
+            for key, value in validators.items()
+            if key.startswith("max_") and value
+        ]
+        if last_modified and timestamps:
+            last_modified = max(timestamps).timestamp()
+        else:
+            last_modified = None
+        etag = quote_etag(
+            hashlib.md5(
+                repr(
+                    (
+                        sorted(validators.items()),
+                        self.request.get_full_path(),
+                        self.request.accepted_renderer.format,
+                        self.get_etag_extra(),
+                    )
+                ).encode()
+            ).hexdigest()
+        )
+
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = get_response()
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_etag_extra(self):
+        # Hook for per-user parts of the representation.
+        return ""
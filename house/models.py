@@ -1,11 +1,35 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from account.models import UserAccount
 
 
+class CategoryQuerySet(models.QuerySet):
+    def refresh_advertisement_counts(self):
+        # Recounted rather than incremented so that a missed signal or two
+        # concurrent writers cannot leave the stored count drifting.
+        active = (
+            Advertisement.objects.filter(
+                is_approved=True, is_rented=False, house__category=OuterRef("pk")
+            )
+            .order_by()
+            .values("house__category")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return self.update(active_advertisement_count=Coalesce(Subquery(active), 0))
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Approved, unrented advertisements in this category, kept current by
+    # house.caching.refresh_category_counts().
+    active_advertisement_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CategoryQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -19,13 +43,18 @@ class House(models.Model):
     description = models.TextField()
     location = models.CharField(max_length=100)
     # image = models.ImageField(upload_to="house/images/", null=True, blank=True)
+    # Holds the URL of the stored image, see house.images.
     image = models.TextField()
+    image_thumbnail = models.CharField(max_length=500, blank=True)
     category = models.ManyToManyField(Category, related_name="house")
     price = models.DecimalField(max_digits=12, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_advertised = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [models.Index(fields=["created_at", "id"])]
+
     def __str__(self):
         return self.title
 
@@ -37,10 +66,59 @@ class Advertisement(models.Model):
     is_approved = models.BooleanField(default=False)
     is_rented = models.BooleanField(default=False)
     is_requested = models.BooleanField(default=False)
+    is_rejected = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_avg = models.FloatField(default=0)
+    rating_histogram = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(
+                fields=["is_approved", "is_rented"], name="advertisement_status_idx"
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(is_approved=True, is_rented=False),
+                name="advertisement_active_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(is_approved=False, is_rejected=False),
+                name="advertisement_pending_idx",
+            ),
+        ]
+
+    REVIEW_STATS_FIELDS = ["review_count", "rating_avg", "rating_histogram"]
 
     def __str__(self):
         return f"Advertisement for {self.house.title}"
 
+    def record_rating(self, rating, delta=1):
+        key = str(rating)
+        count = self.rating_histogram.get(key, 0) + delta
+        if count:
+            self.rating_histogram[key] = count
+        else:
+            self.rating_histogram.pop(key, None)
+        self._update_rating_avg()
+
+    def refresh_review_stats(self):
+        self.rating_histogram = {
+            str(row["rating"]): row["count"]
+            for row in self.reviews.values("rating").annotate(count=models.Count("id"))
+        }
+        self._update_rating_avg()
+
+    def _update_rating_avg(self):
+        self.review_count = sum(self.rating_histogram.values())
+        total = sum(
+            int(rating) * count for rating, count in self.rating_histogram.items()
+        )
+        self.rating_avg = total / self.review_count if self.review_count else 0
+
 
 STATUS_CHOICES = [
     ("PENDING", "Pending"),
@@ -59,6 +137,10 @@ class Review(models.Model):
     rating = models.IntegerField(choices=[(i, i) for i in range(1, 6)])
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at", "id"])]
 
     def __str__(self):
         return f"Review by "
@@ -74,5 +156,19 @@ class RentRequest(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(
+                fields=["advertisement", "status"], name="rent_request_status_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["advertisement", "requested_by"],
+                name="rent_request_unique_requester",
+            ),
+        ]
+
     def __str__(self):
         return f"Request by {self.requested_by} for {self.advertisement.house.title}"
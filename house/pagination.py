@@ -0,0 +1,18 @@
+from rest_framework import pagination
+
+
+class ResultsSetPagination(pagination.PageNumberPagination):
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class CreatedAtCursorPagination(pagination.CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class OldestFirstCursorPagination(CreatedAtCursorPagination):
+    ordering = ("created_at", "id")
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+from rent_ease.metrics import timed
+
+LEAF, NESTED, NESTED_MANY = range(3)
+
+
+def compile_plan(serializer):
+    # Resolve the readable fields once per response instead of once per row.
+    # Concrete columns are read with attrgetter, nested serializers get their
+    # own plan and everything else goes through field.get_attribute() as DRF
+    # would, so the output stays identical to Serializer.to_representation().
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    columns = {
+        field.name
+        for field in (model._meta.concrete_fields if model else [])
+        if not field.is_relation
+    }
+    steps = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.DateTimeField) and not hasattr(
+            field, "timezone"
+        ):
+            # Pin the active timezone so it is not looked up again per value.
+            field.timezone = field.default_timezone()
+        child = getattr(field, "child", None)
+        if _is_plannable(child) and type(field) is serializers.ListSerializer:
+            steps.append(
+                (
+                    field.field_name,
+                    field.get_attribute,
+                    compile_plan(child),
+                    NESTED_MANY,
+                )
+            )
+        elif _is_plannable(field):
+            steps.append(
+                (field.field_name, field.get_attribute, compile_plan(field), NESTED)
+            )
+        elif field.source in columns:
+            steps.append(
+                (
+                    field.field_name,
+                    attrgetter(field.source),
+                    field.to_representation,
+                    LEAF,
+                )
+            )
+        else:
+            steps.append(
+                (field.field_name, field.get_attribute, field.to_representation, LEAF)
+            )
+    return steps
+
+
+def render_plan(steps, instance):
+    row = OrderedDict()
+    for name, get, render, kind in steps:
+        try:
+            value = get(instance)
+        except SkipField:
+            continue
+        if kind == NESTED_MANY:
+            row[name] = [render_plan(render, item) for item in _related(value)]
+        elif (value.pk if isinstance(value, PKOnlyObject) else value) is None:
+            row[name] = None
+        elif kind == NESTED:
+            row[name] = render_plan(render, value)
+        else:
+            row[name] = render(value)
+    return row
+
+
+def _related(value):
+    if not isinstance(value, BaseManager):
+        return value
+    # Iterating the prefetched results directly skips the queryset clone that
+    # .all() makes for every row.
+    cache = getattr(value.instance, "_prefetched_objects_cache", {})
+    name = getattr(value, "prefetch_cache_name", None)
+    return cache[name] if name in cache else value.all()
+
+
+def _is_plannable(field):
+    return (
+        isinstance(field, serializers.Serializer)
+        and type(field).to_representation is serializers.Serializer.to_representation
+    )
+
+
+class PlannedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+    def to_representation(self, data):
+        if not settings.SERIALIZER_PLANS or not _is_plannable(self.child):
+            return super().to_representation(data)
+        steps = compile_plan(self.child)
+        return [render_plan(steps, item) for item in _related(data)]
@@ -0,0 +1,38 @@
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+from rent_ease.metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    # Renders with orjson when it is installed and falls back to the stock
+    # renderer otherwise, or when indented output is requested.
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("render"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if (
+            orjson is None
+            or not settings.FAST_JSON_RENDERER
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        # Match JSONRenderer, which escapes these for JavaScript compatibility.
+        return (
+            orjson.dumps(
+                data,
+                default=encoders.JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+            .replace(b"\xe2\x80\xa8", b"\\u2028")
+            .replace(b"\xe2\x80\xa9", b"\\u2029")
+        )
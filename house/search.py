@@ -0,0 +1,135 @@
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Count, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Category, House
+
+FTS_TABLE = "house_house_fts"
+
+SQLITE_FTS_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, location, description, content='house_house', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON house_house
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON house_house
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE ON house_house
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END""",
+]
+
+
+def get_search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("location", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+    )
+
+
+def get_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+
+    return GinIndex(get_search_vector(), name="house_search_vector_idx")
+
+
+def ensure_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    # The full-text index depends on the database vendor, so it is created here
+    # instead of in House.Meta.indexes.
+    database = connections[using]
+    if database.vendor == "postgresql":
+        with database.cursor() as cursor:
+            constraints = database.introspection.get_constraints(
+                cursor, House._meta.db_table
+            )
+        index = get_search_index()
+        if index.name not in constraints:
+            with database.schema_editor() as editor:
+                editor.add_index(House, index)
+    elif database.vendor == "sqlite":
+        with database.cursor() as cursor:
+            created = FTS_TABLE not in database.introspection.table_names(cursor)
+            for statement in SQLITE_FTS_STATEMENTS:
+                cursor.execute(statement)
+            # The triggers keep the index current from then on, so existing
+            # rows are only indexed when the table is new.
+            if created:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                )
+
+
+def filter_search(queryset, query):
+    if not query:
+        return queryset
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery
+
+        return queryset.alias(search=get_search_vector()).filter(
+            search=SearchQuery(query, config="english", search_type="websearch")
+        )
+
+    if connection.vendor == "sqlite":
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [_fts_match(query)],
+            )
+        )
+
+    for term in query.split():
+        queryset = queryset.filter(
+            Q(title__icontains=term)
+            | Q(location__icontains=term)
+            | Q(description__icontains=term)
+        )
+    return queryset
+
+
+def rank_search(queryset, query):
+    if not query:
+        rank = Value(0.0)
+    elif connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        rank = SearchRank(
+            get_search_vector(),
+            SearchQuery(query, config="english", search_type="websearch"),
+        )
+    elif connection.vendor == "sqlite":
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = house_house.id",
+            [_fts_match(query)],
+        )
+    else:
+        rank = Value(0.0)
+    return queryset.annotate(search_rank=rank).order_by("-search_rank", "-id")
+
+
+def category_facets(queryset):
+    return list(
+        Category.objects.filter(house__in=queryset.values("id"))
+        .annotate(count=Count("house"))
+        .order_by("-count", "name")
+        .values("id", "name", "slug", "count")
+    )
+
+
+def _fts_match(query):
+    # Quote every term so user input can never be parsed as FTS5 syntax.
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
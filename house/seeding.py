@@ -0,0 +1,173 @@
+import random
+from collections import Counter, defaultdict
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from account.models import UserAccount
+
+from . import caching
+from .models import Advertisement, Category, House, RentRequest, Review
+
+CATEGORIES = ["flat", "duplex", "studio", "villa", "sublet", "office"]
+LOCATIONS = ["Dhaka", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Barishal"]
+REVIEW_TEXTS = ["Great location.", "Spacious and bright.", "A bit noisy.", "Fair."]
+
+
+@transaction.atomic
+def seed_dataset(
+    users=50,
+    houses=200,
+    reviews_per_advertisement=5,
+    requests_per_advertisement=3,
+    favourites_per_user=5,
+    seed=None,
+    batch_size=1000,
+):
+    # Bulk-created rows skip save() and signals, so the review statistics,
+    # category counts and caches are brought up to date explicitly at the end.
+    rng = random.Random(seed)
+    prefix = f"seed-{get_random_string(6).lower()}"
+    # Seeded accounts cannot log in and none is staff, so a dataset seeded
+    # into a shared database grants no access.
+    password = make_password(None)
+
+    created_users = User.objects.bulk_create(
+        [
+            User(
+                username=f"{prefix}-{number}",
+                email=f"{prefix}-{number}@example.com",
+                first_name="Seed",
+                last_name=str(number),
+                password=password,
+            )
+            for number in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    accounts = UserAccount.objects.bulk_create(
+        [
+            UserAccount(
+                user=user,
+                account_type="User",
+                address=rng.choice(LOCATIONS),
+                image="https://example.com/avatar.jpg",
+                mobile_number=f"017{number:08d}",
+                is_verified=True,
+            )
+            for number, user in enumerate(created_users)
+        ],
+        batch_size=batch_size,
+    )
+    categories = [
+        Category.objects.get_or_create(slug=slug, defaults={"name": slug.title()})[0]
+        for slug in CATEGORIES
+    ]
+
+    created_houses = House.objects.bulk_create(
+        [
+            House(
+                owner=rng.choice(accounts),
+                title=f"{rng.choice(CATEGORIES).title()} in {location}",
+                description="Seeded listing. " * rng.randint(5, 40),
+                location=location,
+                image="https://example.com/house.jpg",
+                price=rng.randint(5_000, 150_000),
+                is_advertised=rng.random() < 0.8,
+            )
+            for location in (rng.choice(LOCATIONS) for _ in range(houses))
+        ],
+        batch_size=batch_size,
+    )
+    House.category.through.objects.bulk_create(
+        [
+            House.category.through(house_id=house.id, category_id=category.id)
+            for house in created_houses
+            for category in rng.sample(categories, rng.randint(1, 2))
+        ],
+        batch_size=batch_size,
+    )
+
+    advertisements = Advertisement.objects.bulk_create(
+        [
+            Advertisement(
+                house=house,
+                is_approved=rng.random() < 0.9,
+                is_rented=rng.random() < 0.1,
+            )
+            for house in created_houses
+            if house.is_advertised
+        ],
+        batch_size=batch_size,
+    )
+    owners = {house.id: house.owner_id for house in created_houses}
+
+    reviews = []
+    for advertisement in advertisements:
+        for account in rng.sample(
+            accounts, min(rng.randint(0, reviews_per_advertisement), len(accounts))
+        ):
+            reviews.append(
+                Review(
+                    advertisement=advertisement,
+                    user=account,
+                    rating=rng.randint(1, 5),
+                    text=rng.choice(REVIEW_TEXTS),
+                )
+            )
+    Review.objects.bulk_create(reviews, batch_size=batch_size)
+    histograms = defaultdict(Counter)
+    for review in reviews:
+        histograms[review.advertisement_id][str(review.rating)] += 1
+    for advertisement in advertisements:
+        advertisement.rating_histogram = dict(histograms[advertisement.id])
+        advertisement._update_rating_avg()
+    Advertisement.objects.bulk_update(
+        advertisements, Advertisement.REVIEW_STATS_FIELDS, batch_size=batch_size
+    )
+
+    rent_requests = []
+    for advertisement in advertisements:
+        count = min(rng.randint(0, requests_per_advertisement), len(accounts) - 1)
+        requesters = [
+            account
+            for account in rng.sample(accounts, count + 1)
+            if account.id != owners[advertisement.house_id]
+        ]
+        for account in requesters[:count]:
+            rent_requests.append(
+                RentRequest(
+                    advertisement=advertisement,
+                    requested_by=account,
+                    status=rng.choice(["PENDING", "ACCEPTED", "REJECTED"]),
+                )
+            )
+    RentRequest.objects.bulk_create(rent_requests, batch_size=batch_size)
+
+    approved = [
+        advertisement for advertisement in advertisements if advertisement.is_approved
+    ]
+    UserAccount.favourites.through.objects.bulk_create(
+        [
+            UserAccount.favourites.through(
+                useraccount_id=account.id, advertisement_id=advertisement.id
+            )
+            for account in accounts
+            for advertisement in rng.sample(
+                approved, min(rng.randint(0, favourites_per_user), len(approved))
+            )
+        ],
+        batch_size=batch_size,
+    )
+
+    caching.refresh_category_counts(Category.objects.all())
+    caching.invalidate_advertisement_list()
+    return {
+        "users": len(accounts),
+        "houses": len(created_houses),
+        "advertisements": len(advertisements),
+        "reviews": len(reviews),
+        "rent requests": len(rent_requests),
+    }
@@ -2,41 +2,88 @@ from rest_framework import serializers
 
 from account.serializers import UserAccountSerializer
 
+from .images import (
+    ImageReferenceField,
+    save_image,
+    schedule_thumbnail,
+    storage_name,
+)
+from .mixins import EagerLoadingMixin, SparseFieldsetMixin, nested_lookups
+from .plans import PlannedListSerializer
 from .models import Advertisement, Category, House, RentRequest, Review
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
-        fields = "__all__"
+        exclude = ["active_advertisement_count"]
+
+
+class CategoryCountSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ["id", "name", "slug", "active_advertisement_count"]
 
 
-class HouseSerializer(serializers.ModelSerializer):
+class HouseSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     category = CategorySerializer(many=True, read_only=True)
     category_ids = serializers.ListField(write_only=True, required=False)
     owner = UserAccountSerializer(read_only=True)
+    image = ImageReferenceField(prefix="house")
+
+    compact_fields = [
+        "id",
+        "title",
+        "location",
+        "price",
+        "image",
+        "image_thumbnail",
+        "category",
+        "owner",
+        "is_advertised",
+        "created_at",
+    ]
+    select_related_fields = ["owner__user"]
+    prefetch_related_fields = ["category", "owner__favourites"]
 
     class Meta:
         model = House
         fields = "__all__"
+        read_only_fields = ["image_thumbnail"]
+        list_serializer_class = PlannedListSerializer
 
     def create(self, validated_data):
         category_ids = validated_data.pop("category_ids", [])
+        validated_data["image"] = save_image(validated_data["image"])
         house = House.objects.create(**validated_data)
         house.category.set(category_ids)
+        if storage_name(house.image):
+            schedule_thumbnail(house)
         return house
 
     def update(self, instance, validated_data):
         category_ids = validated_data.pop("category_ids", None)
+        if "image" in validated_data:
+            validated_data["image"] = save_image(validated_data["image"])
+            validated_data["image_thumbnail"] = ""
         instance = super().update(instance, validated_data)
         if category_ids is not None:
             instance.category.set(category_ids)
+        if "image" in validated_data and storage_name(instance.image):
+            schedule_thumbnail(instance)
         return instance
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     user = UserAccountSerializer(read_only=True)
 
+    select_related_fields = ["user__user"]
+    prefetch_related_fields = ["user__favourites"]
+
     class Meta:
         model = Review
         fields = "__all__"
@@ -44,16 +91,81 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ["user", "created_at"]
 
 
-class AdvertisementSerializer(serializers.ModelSerializer):
+class AdvertisementSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     house = HouseSerializer(read_only=True)
     house_id = serializers.IntegerField(write_only=True)
-    reviews = ReviewSerializer(many=True, read_only=True)
+
+    select_related_fields = nested_lookups(
+        "house", HouseSerializer.select_related_fields
+    )
+    prefetch_related_fields = nested_lookups(
+        "house", HouseSerializer.prefetch_related_fields
+    )
 
     class Meta:
         model = Advertisement
         fields = "__all__"
         # fields = ["id", "house", "house_id", "is_approved", "is_rented", "reviews"]
-        read_only_fields = ["is_approved", "is_rented"]
+        read_only_fields = [
+            "is_approved",
+            "is_rented",
+            "is_rejected",
+            *Advertisement.REVIEW_STATS_FIELDS,
+        ]
+
+
+class AdvertisementListSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
+    house = HouseSerializer(read_only=True)
+    is_favourite = serializers.BooleanField(read_only=True, default=False)
+
+    compact_fields = [
+        "id",
+        "house",
+        "is_approved",
+        "is_rented",
+        "is_requested",
+        "created_at",
+        "review_count",
+        "rating_avg",
+        "is_favourite",
+    ]
+    select_related_fields = nested_lookups(
+        "house", HouseSerializer.select_related_fields
+    )
+    prefetch_related_fields = nested_lookups(
+        "house", HouseSerializer.prefetch_related_fields
+    )
+
+    class Meta:
+        model = Advertisement
+        fields = "__all__"
+        list_serializer_class = PlannedListSerializer
+
+
+class ModerationAdvertisementSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    title = serializers.CharField(source="house.title", read_only=True)
+    location = serializers.CharField(source="house.location", read_only=True)
+    price = serializers.DecimalField(
+        source="house.price", max_digits=12, decimal_places=2, read_only=True
+    )
+    owner = serializers.CharField(source="house.owner.user.username", read_only=True)
+
+    select_related_fields = ["house__owner__user"]
+
+    class Meta:
+        model = Advertisement
+        fields = ["id", "house", "title", "location", "price", "owner", "created_at"]
+
+
+class ModerationActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=1000
+    )
+    action = serializers.ChoiceField(choices=["approve", "reject"])
 
 
 class RentRequestSerializer(serializers.ModelSerializer):
@@ -64,11 +176,121 @@ class RentRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ["requested_by", "status", "created_at"]
 
 
-class RentRequestShowSerializer(serializers.ModelSerializer):
+class RentRequestShowSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     advertisement = AdvertisementSerializer(read_only=True)
     requested_by = UserAccountSerializer(read_only=True)
 
+    compact_fields = [
+        "id",
+        "advertisement",
+        "status",
+        "created_at",
+        "requested_by.id",
+        "requested_by.user",
+        "requested_by.address",
+        "requested_by.mobile_number",
+        "requested_by.image_thumbnail",
+    ]
+    expandable_fields = ["advertisement"]
+
+    select_related_fields = [
+        "requested_by__user",
+        *nested_lookups("advertisement", AdvertisementSerializer.select_related_fields),
+    ]
+    prefetch_related_fields = [
+        "requested_by__favourites",
+        *nested_lookups(
+            "advertisement", AdvertisementSerializer.prefetch_related_fields
+        ),
+    ]
+
     class Meta:
         model = RentRequest
         fields = "__all__"
         read_only_fields = ["requested_by", "status", "created_at"]
+
+
+class OwnerDashboardSerializer(serializers.ModelSerializer):
+    # Reads the annotations added by views.annotate_dashboard().
+    advertisement_id = serializers.IntegerField(read_only=True)
+    is_approved = serializers.BooleanField(read_only=True)
+    is_rented = serializers.BooleanField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
+    rating_avg = serializers.FloatField(read_only=True)
+    favourite_count = serializers.IntegerField(read_only=True)
+    pending_requests = serializers.IntegerField(read_only=True)
+    accepted_requests = serializers.IntegerField(read_only=True)
+    rejected_requests = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = House
+        fields = [
+            "id",
+            "title",
+            "location",
+            "price",
+            "is_advertised",
+            "created_at",
+            "advertisement_id",
+            "is_approved",
+            "is_rented",
+            "review_count",
+            "rating_avg",
+            "favourite_count",
+            "pending_requests",
+            "accepted_requests",
+            "rejected_requests",
+        ]
+
+
+class RentRequestSummarySerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    username = serializers.CharField(source="requested_by.user.username")
+    first_name = serializers.CharField(source="requested_by.user.first_name")
+    last_name = serializers.CharField(source="requested_by.user.last_name")
+    mobile_number = serializers.CharField(source="requested_by.mobile_number")
+    image_thumbnail = serializers.CharField(source="requested_by.image_thumbnail")
+
+    select_related_fields = ["requested_by__user"]
+
+    class Meta:
+        model = RentRequest
+        fields = [
+            "id",
+            "status",
+            "created_at",
+            "requested_by",
+            "username",
+            "first_name",
+            "last_name",
+            "mobile_number",
+            "image_thumbnail",
+        ]
+
+
+class HouseSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    location = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    min_price = serializers.DecimalField(
+        required=False, max_digits=12, decimal_places=2
+    )
+    max_price = serializers.DecimalField(
+        required=False, max_digits=12, decimal_places=2
+    )
+    category = serializers.IntegerField(required=False)
+
+
+class HouseSearchResultSerializer(HouseSerializer):
+    advertisement_id = serializers.IntegerField(
+        source="advertisement.id", read_only=True
+    )
+    search_rank = serializers.FloatField(read_only=True)
+
+    compact_fields = [
+        *HouseSerializer.compact_fields,
+        "advertisement_id",
+        "search_rank",
+    ]
+
+    select_related_fields = [*HouseSerializer.select_related_fields, "advertisement"]
@@ -0,0 +1,86 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .caching import (
+    invalidate_advertisement_list,
+    invalidate_category_catalogue,
+    refresh_category_counts,
+)
+from .models import Advertisement, Category, House, Review
+
+COUNTED_FIELDS = {"is_approved", "is_rented"}
+# The flag that puts a row in the cached anonymous listing.
+LISTED_FIELDS = {House: "is_advertised", Advertisement: "is_approved"}
+
+
+@receiver(pre_save, sender=House)
+@receiver(pre_save, sender=Advertisement)
+def listing_saving(sender, instance, **kwargs):
+    # Saving a listed row is handled after the save; here only rows that are
+    # being taken out of the listing are looked up.
+    field = LISTED_FIELDS[sender]
+    if getattr(instance, field) or instance.pk is None:
+        return
+    if sender.objects.filter(pk=instance.pk, **{field: True}).exists():
+        invalidate_advertisement_list()
+
+
+@receiver([post_save, post_delete], sender=House)
+def house_changed(sender, instance, **kwargs):
+    if instance.is_advertised:
+        invalidate_advertisement_list()
+
+
+@receiver([post_save, post_delete], sender=Advertisement)
+def advertisement_changed(sender, instance, **kwargs):
+    if instance.is_approved:
+        invalidate_advertisement_list()
+
+
+@receiver(post_save, sender=Advertisement)
+def advertisement_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or COUNTED_FIELDS.intersection(update_fields):
+        refresh_category_counts(Category.objects.filter(house=instance.house_id))
+
+
+@receiver(pre_delete, sender=Advertisement)
+def advertisement_deleting(sender, instance, **kwargs):
+    # The house's category rows may be gone by post_delete, so they are
+    # looked up while they still exist.
+    category_ids = list(
+        Category.objects.filter(house=instance.house_id).values_list("pk", flat=True)
+    )
+    refresh_category_counts(Category.objects.filter(pk__in=category_ids))
+
+
+@receiver([post_save, post_delete], sender=Review)
+def review_changed(sender, instance, **kwargs):
+    invalidate_advertisement_list()
+
+
+@receiver([post_save, post_delete], sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate_advertisement_list()
+    invalidate_category_catalogue()
+
+
+@receiver(m2m_changed, sender=House.category.through)
+def house_category_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_advertisement_list()
+
+    if action not in ("pre_clear", "post_add", "post_remove"):
+        return
+    if reverse:
+        category_ids = [instance.pk]
+    elif action == "pre_clear":
+        category_ids = list(instance.category.values_list("pk", flat=True))
+    else:
+        category_ids = list(pk_set)
+    refresh_category_counts(Category.objects.filter(pk__in=category_ids))
@@ -0,0 +1,1386 @@
+import base64
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.http import HttpResponse
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APITestCase
+
+from account import urls as account_urls
+from account.models import UserAccount
+from rent_ease.middleware import PerformanceMiddleware
+
+from . import (
+    benchmarking,
+    bulk,
+    caching,
+    images,
+    models,
+    search,
+    seeding,
+    urls,
+    views,
+)
+
+
+def create_account(username, **kwargs):
+    user = User.objects.create_user(username=username, password="password")
+    return UserAccount.objects.create(user=user, **kwargs)
+
+
+def create_advertisement(owner, category, **kwargs):
+    house = models.House.objects.create(
+        owner=owner,
+        title="House",
+        description="Description",
+        location="Dhaka",
+        image="https://example.com/house.jpg",
+        price="1000.00",
+        is_advertised=True,
+    )
+    house.category.add(category)
+    return models.Advertisement.objects.create(house=house, **kwargs)
+
+
+class AdvertisedHouseQueryCountTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.owner = create_account("owner")
+        self.reviewer = create_account("reviewer")
+
+    def add_advertisements(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                advertisement = create_advertisement(
+                    self.owner, self.category, is_approved=True
+                )
+                self.owner.favourites.add(advertisement)
+                models.Review.objects.create(
+                    advertisement=advertisement,
+                    user=self.reviewer,
+                    rating=5,
+                    text="Ok",
+                )
+
+    def add_rent_requests(self, count):
+        for _ in range(count):
+            advertisement = create_advertisement(
+                self.owner, self.category, is_approved=True
+            )
+            models.RentRequest.objects.create(
+                advertisement=advertisement, requested_by=self.reviewer
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_is_independent_of_result_size(self):
+        url = "/house/advertisements/list/"
+        self.add_advertisements(2)
+        small = self.count_queries(url)
+        self.add_advertisements(10)
+        large = self.count_queries(url)
+        self.assertEqual(small, large)
+
+    def test_rent_request_query_count_is_independent_of_result_size(self):
+        self.client.force_authenticate(self.owner.user)
+        url = "/house/show-rent/"
+        self.add_rent_requests(2)
+        small = self.count_queries(url)
+        self.add_rent_requests(10)
+        large = self.count_queries(url)
+        self.assertEqual(small, large)
+
+
+class AdvertisementListCacheTests(APITestCase):
+    url = "/house/advertisements/list/"
+
+    def setUp(self):
+        cache.clear()
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.owner = create_account("owner")
+        self.advertisement = create_advertisement(
+            self.owner, self.category, is_approved=True
+        )
+
+    def test_anonymous_listing_is_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(self.url, {"page_size": 5})["X-Cache"], "MISS")
+        self.assertEqual(
+            caching.get_advertisement_list_stats(), {"hits": 1, "misses": 2}
+        )
+
+    def test_review_invalidates_cached_listing(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.owner.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/house/review/",
+                {"advertisement": self.advertisement.id, "rating": 4, "text": "Ok"},
+            )
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["review_count"], 1)
+
+    def test_unapproving_invalidates_cached_listing(self):
+        self.client.get(self.url)
+        self.advertisement.is_approved = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.advertisement.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"], [])
+
+    def test_unadvertising_invalidates_cached_listing(self):
+        self.client.get(self.url)
+        house = self.advertisement.house
+        house.is_advertised = False
+        with self.captureOnCommitCallbacks(execute=True):
+            house.save()
+
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+
+    def test_only_shown_owner_changes_invalidate_cached_listing(self):
+        self.client.get(self.url)
+        user = self.owner.user
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username="owner", password="password")
+            self.client.logout()
+            user.set_password("changed")
+            user.save()
+            self.owner.address = "Chittagong"
+            self.owner.save()
+            create_account("newcomer")
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        user.first_name = "Olive"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.data["results"][0]["house"]["owner"]["user"]["first_name"],
+            "Olive",
+        )
+
+    def test_unrelated_house_does_not_invalidate_cached_listing(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            models.House.objects.create(
+                owner=self.owner,
+                title="Draft",
+                description="Description",
+                location="Dhaka",
+                image="",
+                price="10.00",
+            )
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+
+class CursorPaginationTests(APITestCase):
+    def test_cursor_pages_cover_every_house_once(self):
+        owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        created = {create_advertisement(owner, category).house_id for _ in range(5)}
+
+        seen = []
+        url = "/house/list/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen += [house["id"] for house in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), sorted(created))
+
+
+class ReviewStatsTests(APITestCase):
+    def setUp(self):
+        self.owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisement = create_advertisement(owner=self.owner, category=category)
+        self.client.force_authenticate(self.owner.user)
+
+    def post_review(self, rating):
+        response = self.client.post(
+            "/house/review/",
+            {"advertisement": self.advertisement.id, "rating": rating, "text": "Ok"},
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["review_id"]
+
+    def test_reviews_maintain_aggregates(self):
+        self.post_review(5)
+        review_id = self.post_review(2)
+        self.client.patch(f"/house/review/{review_id}/", {"rating": 3})
+        self.post_review(1)
+        self.client.delete(f"/house/review/{review_id}/")
+
+        self.advertisement.refresh_from_db()
+        self.assertEqual(self.advertisement.review_count, 2)
+        self.assertEqual(self.advertisement.rating_avg, 3)
+        self.assertEqual(self.advertisement.rating_histogram, {"1": 1, "5": 1})
+
+        self.advertisement.refresh_review_stats()
+        self.assertEqual(self.advertisement.rating_histogram, {"1": 1, "5": 1})
+
+
+class HouseSearchTests(APITestCase):
+    url = "/house/search/"
+
+    def setUp(self):
+        owner = create_account("owner")
+        self.flat = models.Category.objects.create(name="Flat", slug="flat")
+        self.villa = models.Category.objects.create(name="Villa", slug="villa")
+        self.lake = create_advertisement(owner, self.flat, is_approved=True).house
+        self.lake.title = "Lake view apartment"
+        self.lake.save()
+        self.garden = create_advertisement(owner, self.villa, is_approved=True).house
+        self.garden.title = "Garden villa near the lake"
+        self.garden.location = "Sylhet"
+        self.garden.price = "5000.00"
+        self.garden.save()
+        create_advertisement(owner, self.flat)
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_ranks_title_matches_and_counts_facets(self):
+        data = self.search(q="lake")
+        self.assertEqual(
+            [house["id"] for house in data["results"]], [self.lake.id, self.garden.id]
+        )
+        self.assertEqual(
+            {facet["slug"]: facet["count"] for facet in data["facets"]},
+            {"flat": 1, "villa": 1},
+        )
+
+    def test_filters_by_price_location_and_category(self):
+        self.assertEqual(self.search(min_price="2000")["count"], 1)
+        self.assertEqual(self.search(location="sylhet")["count"], 1)
+        self.assertEqual(self.search(q="lake", category=self.flat.id)["count"], 1)
+        self.assertEqual(self.search(q='"lake OR')["count"], 0)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 index")
+    def test_index_is_only_rebuilt_when_created(self):
+        def rebuilds():
+            with CaptureQueriesContext(connection) as queries:
+                search.ensure_search_index()
+            return [query for query in queries if "'rebuild'" in query["sql"]]
+
+        self.assertEqual(rebuilds(), [])
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {search.FTS_TABLE}")
+        self.assertEqual(len(rebuilds()), 1)
+        self.assertEqual(self.search(q="lake")["count"], 2)
+
+
+class HouseImageTests(APITestCase):
+    def setUp(self):
+        self.media_root = media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, IMAGE_THUMBNAIL_ASYNC=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.owner = create_account("owner")
+        self.client.force_authenticate(self.owner.user)
+
+    def data_url(self):
+        output = io.BytesIO()
+        Image.new("RGB", (1200, 800), "red").save(output, format="PNG")
+        return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+
+    def create_house(self, image, price="1000.00"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/house/list/",
+                {
+                    "title": "House",
+                    "description": "Description",
+                    "location": "Dhaka",
+                    "image": image,
+                    "price": price,
+                },
+            )
+        return response
+
+    def test_inline_image_is_stored_with_thumbnail(self):
+        response = self.create_house(self.data_url())
+        self.assertEqual(response.status_code, 201)
+        house = models.House.objects.get(pk=response.data["id"])
+        self.assertTrue(house.image.startswith("/media/house/"))
+        self.assertTrue(house.image_thumbnail.startswith("/media/house/thumbnails/"))
+
+    def test_remote_url_is_kept(self):
+        response = self.create_house("https://example.com/house.jpg")
+        self.assertEqual(response.data["image"], "https://example.com/house.jpg")
+        self.assertEqual(response.data["image_thumbnail"], "")
+
+    def test_invalid_inline_image_is_rejected(self):
+        response = self.create_house("data:image/png;base64,bm90IGFuIGltYWdl")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(IMAGE_MAX_UPLOAD_SIZE=10)
+    def test_oversized_upload_is_rejected_before_reading(self):
+        upload = File(mock.Mock(size=11))
+        with self.assertRaisesMessage(ValidationError, "too large"):
+            images.validate_image(upload, "house")
+        upload.file.read.assert_not_called()
+
+    def test_decompression_bomb_is_rejected(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            response = self.create_house(self.data_url())
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_bounded_image_urls_are_kept(self):
+        for image in ["x" * 100, "ftp://example.com/house.jpg", "/media/../x.jpg"]:
+            with self.subTest(image=image):
+                self.assertEqual(self.create_house(image).status_code, 400)
+        long_url = "https://example.com/" + "a" * 2048
+        self.assertEqual(self.create_house(long_url).status_code, 400)
+
+    def test_rejected_request_stores_no_file(self):
+        response = self.create_house(self.data_url(), price="not a price")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(os.listdir(self.media_root), [])
+
+
+class AcceptRentRequestConcurrencyTests(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisement = create_advertisement(
+            self.owner, category, is_approved=True
+        )
+        self.rent_requests = [
+            models.RentRequest.objects.create(
+                advertisement=self.advertisement,
+                requested_by=create_account(f"tenant-{number}"),
+            )
+            for number in range(self.threads)
+        ]
+
+    def accept(self, barrier, rent_request):
+        client = APIClient()
+        client.force_authenticate(self.owner.user)
+        barrier.wait()
+        deadline = time.monotonic() + 10
+        try:
+            while True:
+                try:
+                    return client.post(
+                        f"/house/accept-rent-request/{rent_request.id}/"
+                    ).status_code
+                except OperationalError:
+                    # SQLite's shared in-memory test database reports lock
+                    # contention immediately instead of waiting for the lock,
+                    # sometimes on a COMMIT that still went through; retrying
+                    # is safe because accepting is idempotent.
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.01)
+        finally:
+            connection.close()
+
+    def test_exactly_one_concurrent_acceptance_wins(self):
+        barrier = threading.Barrier(self.threads)
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            statuses = list(
+                executor.map(partial(self.accept, barrier), self.rent_requests)
+            )
+
+        self.assertEqual(statuses.count(200), 1)
+        self.assertEqual(statuses.count(400), self.threads - 1)
+        self.advertisement.refresh_from_db()
+        self.assertTrue(self.advertisement.is_rented)
+        self.assertEqual(
+            models.RentRequest.objects.filter(status="ACCEPTED").count(), 1
+        )
+        self.assertFalse(models.RentRequest.objects.filter(status="PENDING").exists())
+
+    def test_benchmark_reports_accept_throughput(self):
+        stdout = io.StringIO()
+        # The test database already is a throwaway one.
+        with mock.patch.object(
+            benchmarking, "throwaway_database", return_value=contextlib.nullcontext()
+        ):
+            call_command(
+                "benchmark_accept",
+                advertisements=2,
+                requests=self.threads,
+                threads=self.threads,
+                stdout=stdout,
+            )
+
+        self.assertIn("16 accepts for 2 advertisements", stdout.getvalue())
+        self.assertIn("requests/s", stdout.getvalue())
+
+
+class DuplicateRequestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.tenant = create_account("tenant")
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+
+    def test_second_rent_request_is_rejected_by_constraint(self):
+        advertisement = create_advertisement(
+            self.owner, self.category, is_approved=True
+        )
+        self.client.force_authenticate(self.tenant.user)
+        data = {"advertisement": advertisement.id}
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.post("/house/request-rent/", data)
+        self.assertFalse(
+            any(
+                query["sql"].lstrip().upper().startswith("SELECT")
+                and "house_rentrequest" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+        second = self.client.post("/house/request-rent/", data)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(models.RentRequest.objects.count(), 1)
+        advertisement.refresh_from_db()
+        self.assertTrue(advertisement.is_requested)
+
+    def test_second_advertisement_for_house_is_rejected(self):
+        advertisement = create_advertisement(self.owner, self.category)
+        self.client.force_authenticate(self.owner.user)
+
+        response = self.client.post(
+            "/house/create-advertisement/", {"house_id": advertisement.house_id}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(models.Advertisement.objects.count(), 1)
+
+    def test_advertisement_for_missing_house(self):
+        self.client.force_authenticate(self.owner.user)
+
+        response = self.client.post("/house/create-advertisement/", {"house_id": 999})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(models.Advertisement.objects.exists())
+
+    def test_advertisement_marks_house_as_advertised(self):
+        house = models.House.objects.create(
+            owner=self.owner,
+            title="House",
+            description="Description",
+            location="Dhaka",
+            image="https://example.com/house.jpg",
+            price="1000.00",
+        )
+        self.client.force_authenticate(self.owner.user)
+
+        response = self.client.post(
+            "/house/create-advertisement/", {"house_id": house.id}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        house.refresh_from_db()
+        self.assertTrue(house.is_advertised)
+
+
+class HouseBulkTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.flat = models.Category.objects.create(name="Flat", slug="flat")
+        self.duplex = models.Category.objects.create(name="Duplex", slug="duplex")
+        self.client.force_authenticate(self.owner.user)
+
+    def upload(self, name, content):
+        return self.client.post(
+            "/house/import/",
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def csv_rows(self, count):
+        header = "title,description,location,image,price,category_ids\n"
+        row = f"House,Nice,Dhaka,https://example.com/h.jpg,1000,{self.flat.id};{self.duplex.id}\n"
+        return header + row * count
+
+    def test_csv_import_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.upload("houses.csv", self.csv_rows(2))
+        with CaptureQueriesContext(connection) as large:
+            response = self.upload("houses.csv", self.csv_rows(50))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 50)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(models.House.category.through.objects.count(), 2 * 52)
+
+    def test_jsonl_import_reports_row_errors(self):
+        lines = [
+            {
+                "title": "A",
+                "description": "D",
+                "location": "Dhaka",
+                "image": "https://example.com/a.jpg",
+                "price": 10,
+                "category_ids": [self.flat.id],
+            },
+            {
+                "title": "B",
+                "description": "D",
+                "location": "Dhaka",
+                "image": "https://example.com/b.jpg",
+                "price": 10,
+                "category_ids": [999],
+            },
+            "not json",
+        ]
+        content = "\n".join(
+            line if isinstance(line, str) else json.dumps(line) for line in lines
+        )
+
+        response = self.upload("houses.jsonl", content)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3])
+        self.assertEqual(models.House.objects.get().owner, self.owner)
+
+    def test_unparseable_file_is_rejected_before_any_chunk_is_written(self):
+        content = self.csv_rows(3).encode() + b"\xff\xfe,broken\n"
+        import_houses = partial(bulk.import_houses, chunk_size=1)
+        with mock.patch.object(bulk, "import_houses", import_houses):
+            response = self.client.post(
+                "/house/import/",
+                {"file": SimpleUploadedFile("houses.csv", content)},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(models.House.objects.exists())
+
+    def test_command_rejects_unparseable_file_before_any_chunk_is_written(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "houses.csv")
+        with open(path, "wb") as file:
+            file.write(self.csv_rows(3).encode() + b"\xff\xfe,broken\n")
+
+        with self.assertRaisesMessage(CommandError, "could not be parsed"):
+            call_command("import_houses", path, owner="owner", chunk_size=1)
+        self.assertFalse(models.House.objects.exists())
+
+        with open(path, "w") as file:
+            file.write(self.csv_rows(3))
+        call_command(
+            "import_houses", path, owner="owner", chunk_size=1, stdout=io.StringIO()
+        )
+        self.assertEqual(models.House.objects.count(), 3)
+
+    @override_settings(IMAGE_THUMBNAIL_ASYNC=False)
+    def test_inline_image_is_stored(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        output = io.BytesIO()
+        Image.new("RGB", (400, 300), "red").save(output, format="PNG")
+        row = {
+            "title": "A",
+            "description": "D",
+            "location": "Dhaka",
+            "image": "data:image/png;base64,"
+            + base64.b64encode(output.getvalue()).decode(),
+            "price": 10,
+        }
+
+        with override_settings(MEDIA_ROOT=media_root):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload("houses.jsonl", json.dumps(row))
+
+        self.assertEqual(response.status_code, 201)
+        house = models.House.objects.get()
+        self.assertTrue(house.image.startswith("/media/house/"))
+        self.assertTrue(house.image_thumbnail.startswith("/media/house/thumbnails/"))
+
+    def test_export_streams_own_houses(self):
+        self.upload("houses.csv", self.csv_rows(3))
+        create_advertisement(create_account("other"), self.flat)
+
+        response = self.client.get("/house/export/", {"file_format": "jsonl"})
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["category_ids"], [self.flat.id, self.duplex.id])
+
+    def test_csv_export_can_be_imported_again(self):
+        self.upload("houses.csv", self.csv_rows(2))
+
+        response = self.client.get("/house/export/")
+        exported = b"".join(response.streaming_content).decode()
+        reimport = self.upload("houses.csv", exported)
+
+        self.assertEqual(reimport.data["created"], 2)
+        self.assertEqual(models.House.objects.count(), 4)
+
+
+class ModerationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_queue_lists_pending_oldest_first_with_constant_queries(self):
+        pending = [create_advertisement(self.owner, self.category) for _ in range(3)]
+        create_advertisement(self.owner, self.category, is_approved=True)
+        create_advertisement(self.owner, self.category, is_rejected=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/house/moderation/")
+
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [advertisement.id for advertisement in pending],
+        )
+        self.assertEqual(response.data["results"][0]["owner"], "owner")
+        self.assertEqual(len(queries), 1)
+
+    def test_queue_requires_admin(self):
+        self.client.force_authenticate(self.owner.user)
+
+        self.assertEqual(self.client.get("/house/moderation/").status_code, 403)
+
+    def test_bulk_approve_issues_one_update_and_invalidates_once(self):
+        advertisements = [
+            create_advertisement(self.owner, self.category) for _ in range(5)
+        ]
+        generation = caching.get_generation()
+        ids = [advertisement.id for advertisement in advertisements[:4]]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    "/house/moderate-advertisements/",
+                    {"ids": ids, "action": "approve"},
+                    format="json",
+                )
+
+        self.assertEqual(response.data, {"updated": 4})
+        self.assertEqual(
+            [query["sql"].split()[0] for query in queries.captured_queries],
+            ["UPDATE"],
+        )
+        # One list invalidation and one category recount for the whole batch.
+        self.assertEqual(len(callbacks), 2)
+        self.assertNotEqual(caching.get_generation(), generation)
+        self.assertEqual(
+            set(
+                models.Advertisement.objects.filter(is_approved=True).values_list(
+                    "id", flat=True
+                )
+            ),
+            set(ids),
+        )
+
+    def test_bulk_reject_removes_from_queue(self):
+        advertisement = create_advertisement(self.owner, self.category)
+
+        self.client.post(
+            "/house/moderate-advertisements/",
+            {"ids": [advertisement.id], "action": "reject"},
+            format="json",
+        )
+
+        advertisement.refresh_from_db()
+        self.assertTrue(advertisement.is_rejected)
+        self.assertFalse(advertisement.is_approved)
+        self.assertEqual(self.client.get("/house/moderation/").data["results"], [])
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.tenant = create_account("tenant")
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisement = create_advertisement(
+            self.owner, self.category, is_approved=True
+        )
+
+    def test_list_is_compact_and_skips_unused_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/house/list/")
+
+        house = response.data["results"][0]
+        self.assertNotIn("description", house)
+        self.assertNotIn("favourites", house["owner"])
+        self.assertNotIn('"description"', queries.captured_queries[-1]["sql"])
+        self.assertFalse(
+            any("favourites" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_fields_selects_nested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/house/advertisements/list/", {"fields": "id,house.title"}
+            )
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.advertisement.id, "house": {"title": "House"}}],
+        )
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertNotIn('"image"', sql)
+        self.assertNotIn('"rating_histogram"', sql)
+        # The conditional-request validators and the page itself.
+        self.assertEqual(len(queries), 2)
+
+    def test_detail_keeps_full_representation(self):
+        response = self.client.get(f"/house/list/{self.advertisement.house_id}/")
+
+        self.assertEqual(response.data["description"], "Description")
+        self.assertIn("favourites", response.data["owner"])
+
+    def test_rent_request_list_expands_advertisement_on_request(self):
+        models.RentRequest.objects.create(
+            advertisement=self.advertisement, requested_by=self.tenant
+        )
+        self.client.force_authenticate(self.owner.user)
+
+        compact = self.client.get("/house/show-rent/").data["results"][0]
+        expanded = self.client.get(
+            "/house/show-rent/", {"expand": "advertisement"}
+        ).data["results"][0]
+
+        self.assertEqual(compact["advertisement"], self.advertisement.id)
+        self.assertEqual(compact["requested_by"]["mobile_number"], "")
+        self.assertEqual(expanded["advertisement"]["house"]["title"], "House")
+
+
+class FastSerializationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        for number in range(3):
+            advertisement = create_advertisement(
+                owner, category, is_approved=True, rating_avg=4.5
+            )
+            owner.favourites.add(advertisement)
+        models.House.objects.update(title="Line\u2028separated বাড়ি")
+        self.client.force_authenticate(owner.user)
+
+    def test_fast_path_responses_are_byte_identical(self):
+        for url in ("/house/advertisements/list/", "/house/list/", "/house/search/"):
+            with self.subTest(url=url):
+                with override_settings(
+                    SERIALIZER_PLANS=False, FAST_JSON_RENDERER=False
+                ):
+                    stock = self.client.get(url)
+                fast = self.client.get(url)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, stock.content)
+
+    def test_sparse_fields_are_byte_identical(self):
+        params = {"fields": "id,is_favourite,house.title,house.category.name"}
+        with override_settings(SERIALIZER_PLANS=False, FAST_JSON_RENDERER=False):
+            stock = self.client.get("/house/advertisements/list/", params)
+        fast = self.client.get("/house/advertisements/list/", params)
+
+        self.assertEqual(fast.content, stock.content)
+        self.assertTrue(fast.data["results"][0]["is_favourite"])
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisement = create_advertisement(
+            self.owner, self.category, is_approved=True
+        )
+
+    def test_current_client_gets_304_from_one_query(self):
+        detail = f"/house/list/{self.advertisement.house_id}/"
+        for url in (
+            "/house/list/",
+            "/house/advertisements/list/",
+            "/house/category/",
+            detail,
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                # Only single objects carry Last-Modified.
+                self.assertEqual("Last-Modified" in response, url == detail)
+
+                with CaptureQueriesContext(connection) as queries:
+                    cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b"")
+                # The anonymous advertisement list answers from its cache.
+                self.assertLessEqual(len(queries), 1)
+
+    def test_malformed_pk_is_not_found(self):
+        for url in (
+            "/house/list/abc/",
+            "/house/advertisements/list/abc/",
+            "/house/category/abc/",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_rows_leaving_a_list_are_not_hidden_by_if_modified_since(self):
+        other = create_advertisement(self.owner, self.category, is_approved=True)
+        self.client.force_authenticate(self.owner.user)
+        for url in ("/house/list/", "/house/advertisements/list/"):
+            with self.subTest(url=url):
+                self.assertNotIn("Last-Modified", self.client.get(url))
+        detail = self.client.get(f"/house/list/{self.advertisement.house_id}/")
+        since = detail["Last-Modified"]
+
+        other.house.delete()
+        response = self.client.get(
+            "/house/advertisements/list/", HTTP_IF_MODIFIED_SINCE=since
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def add_review(self):
+        with transaction.atomic():
+            models.Review.objects.create(
+                advertisement=self.advertisement, user=self.owner, rating=4, text="Ok"
+            )
+            views.record_rating(self.advertisement.id, 4)
+
+    def test_changes_invalidate_etag(self):
+        url = "/house/advertisements/list/"
+        etag = self.client.get(url)["ETag"]
+
+        for change in (
+            self.category.save,
+            self.advertisement.house.save,
+            self.add_review,
+            partial(create_advertisement, self.owner, self.category, is_approved=True),
+        ):
+            time.sleep(0.001)
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+
+    def test_owner_changes_invalidate_etag(self):
+        self.client.force_authenticate(self.owner.user)
+        for url in (
+            "/house/advertisements/list/",
+            f"/house/list/{self.advertisement.house_id}/",
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                time.sleep(0.001)
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.post(
+                        "/account/updateProfile/", {"first_name": f"Owner {url}"}
+                    )
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(f"Owner {url}", response.content.decode())
+
+    def test_etag_depends_on_favourites_and_query(self):
+        url = "/house/advertisements/list/"
+        token = Token.objects.create(user=self.owner.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        etag = self.client.get(url)["ETag"]
+
+        self.assertNotEqual(self.client.get(url, {"page_size": 1})["ETag"], etag)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+            )
+        self.assertEqual(len(queries), 1)
+
+        time.sleep(0.001)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/account/profile/favorites/add/{self.advertisement.id}/")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner", mobile_number="017")
+        self.category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisements = [
+            create_advertisement(self.owner, self.category, is_approved=True)
+            for _ in range(3)
+        ]
+        self.owner.favourites.add(self.advertisements[0])
+        models.Review.objects.create(
+            advertisement=self.advertisements[0], user=self.owner, rating=5, text="Ok"
+        )
+        self.token = Token.objects.create(user=self.owner.user)
+        self.async_client = AsyncClient()
+
+    async def test_advertisement_list_matches_sync_results(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        response = await self.async_client.get(
+            "/house/async/advertisements/", {"page_size": 2}, headers=headers
+        )
+        data = response.json()
+        following = await self.async_client.get(data["next"], headers=headers)
+
+        sync = await sync_to_async(self.sync_list)()
+        self.assertEqual(data["results"] + following.json()["results"], sync["results"])
+        self.assertIsNone(following.json()["next"])
+
+    def sync_list(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        return self.client.get("/house/advertisements/list/").json()
+
+    async def test_detail_categories_and_reviews(self):
+        advertisement = self.advertisements[0]
+        detail = await self.async_client.get(
+            f"/house/async/advertisements/{advertisement.id}/"
+        )
+        categories = await self.async_client.get("/house/async/categories/")
+        reviews = await self.async_client.get(
+            "/house/async/reviews/", {"advertisement": advertisement.id}
+        )
+        missing = await self.async_client.get("/house/async/advertisements/0/")
+
+        self.assertNotIn("reviews", detail.json())
+        self.assertEqual(reviews.json()["results"][0]["text"], "Ok")
+        self.assertEqual(categories.json()[0]["slug"], "flat")
+        self.assertEqual(reviews.json()["results"][0]["rating"], 5)
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_invalid_cursor_returns_404(self):
+        response = await self.async_client.get(
+            "/house/async/advertisements/", {"cursor": "not-a-cursor"}
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+
+class CategoryCountTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = create_account("owner")
+        self.flat = models.Category.objects.create(name="Flat", slug="flat")
+        self.villa = models.Category.objects.create(name="Villa", slug="villa")
+        self.admin = User.objects.create_user(username="admin", is_staff=True)
+
+    def counts(self):
+        return {
+            row["slug"]: row["active_advertisement_count"]
+            for row in self.client.get("/house/category/counts/").data
+        }
+
+    def test_counts_follow_approval_category_changes_and_rental(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement = create_advertisement(self.owner, self.flat)
+        self.assertEqual(self.counts(), {"flat": 0, "villa": 0})
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/house/moderate-advertisements/",
+                {"ids": [advertisement.id], "action": "approve"},
+                format="json",
+            )
+        self.assertEqual(self.counts(), {"flat": 1, "villa": 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement.house.category.add(self.villa)
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement.house.category.remove(self.flat)
+        self.assertEqual(self.counts(), {"flat": 0, "villa": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement.is_rented = True
+            advertisement.save()
+        self.assertEqual(self.counts(), {"flat": 0, "villa": 0})
+
+    def test_house_delete_decrements_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement = create_advertisement(
+                self.owner, self.flat, is_approved=True
+            )
+        self.assertEqual(self.counts()["flat"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            advertisement.house.delete()
+        self.assertEqual(self.counts()["flat"], 0)
+
+    def test_catalogue_is_served_without_queries(self):
+        self.client.get("/house/category/")
+        with self.assertNumQueries(0):
+            categories = self.client.get("/house/category/")
+            counts = self.client.get("/house/category/counts/")
+        self.assertEqual([row["slug"] for row in categories.data], ["flat", "villa"])
+        self.assertNotIn("active_advertisement_count", categories.data[0])
+        self.assertEqual(len(counts.data), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.villa.name = "Villas"
+            self.villa.save()
+        self.assertEqual(self.client.get("/house/category/").data[1]["name"], "Villas")
+
+    def test_catalogue_expires_without_an_invalidation(self):
+        # As when another worker's generation bump lands in its own locmem cache.
+        first = self.client.get("/house/category/")
+        models.Category.objects.filter(pk=self.villa.pk).update(name="Villas")
+        self.assertEqual(self.client.get("/house/category/").data[1]["name"], "Villa")
+
+        with override_settings(CATEGORY_CATALOGUE_MAX_AGE=0):
+            response = self.client.get(
+                "/house/category/", HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[1]["name"], "Villas")
+
+
+@override_settings(METRICS_TOKEN="scrape")
+class PerformanceMiddlewareTests(APITestCase):
+    scrape = {"Authorization": "Bearer scrape"}
+
+    def setUp(self):
+        cache.clear()
+        owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        create_advertisement(owner, category, is_approved=True)
+
+    def test_server_timing_reports_queries_and_phases(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/house/list/")
+
+        timing = response["Server-Timing"]
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("render;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_metrics_endpoint_exposes_histograms_and_cache_stats(self):
+        self.client.get("/house/advertisements/list/")
+        body = self.client.get("/metrics", headers=self.scrape).content.decode()
+
+        labels = 'view="advertisement_list-list",method="GET",status="200"'
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}', body
+        )
+        self.assertIn(f"http_request_db_queries_count{{{labels}}}", body)
+        self.assertIn('advertisement_list_cache_requests_total{result="miss"} 1', body)
+
+    def test_metrics_endpoint_requires_configured_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get("/metrics", headers=self.scrape)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_endpoint_is_staff_only_without_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        User.objects.create_user(username="admin", password="pw", is_staff=True)
+        self.client.login(username="admin", password="pw")
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    def test_query_budget_overrun_is_logged_and_counted(self):
+        with mock.patch.object(views.HouseViewSet, "query_budget", 1, create=True):
+            with self.assertLogs("rent_ease.middleware", "WARNING") as logs:
+                self.client.get("/house/list/")
+
+        self.assertIn("house-list ran", logs.output[0])
+        self.assertIn(
+            'http_request_query_budget_exceeded_total{view="house-list"}',
+            self.client.get("/metrics", headers=self.scrape).content.decode(),
+        )
+
+    async def test_async_views_are_not_adapted(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(get_response)))
+        response = await AsyncClient().get("/house/async/categories/")
+
+        self.assertIn("queries", response["Server-Timing"])
+
+
+class SeedAndBenchmarkTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_dataset_keeps_derived_data_consistent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = seeding.seed_dataset(users=8, houses=30, seed=1)
+
+        self.assertEqual(models.House.objects.count(), counts["houses"])
+        self.assertEqual(models.Review.objects.count(), counts["reviews"])
+        self.assertFalse(User.objects.filter(is_staff=True).exists())
+        self.assertFalse(User.objects.first().has_usable_password())
+        for advertisement in models.Advertisement.objects.all():
+            expected = models.Advertisement(pk=advertisement.pk)
+            expected.refresh_review_stats()
+            self.assertEqual(advertisement.review_count, expected.review_count)
+        for category in models.Category.objects.all():
+            self.assertEqual(
+                category.active_advertisement_count,
+                models.Advertisement.objects.filter(
+                    is_approved=True, is_rented=False, house__category=category
+                ).count(),
+            )
+
+    def test_benchmark_api_fails_on_query_regression(self):
+        baseline = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(baseline))
+        # The test database already is a throwaway one.
+        throwaway = mock.patch.object(
+            benchmarking, "throwaway_database", return_value=contextlib.nullcontext()
+        )
+        throwaway_database = throwaway.start()
+        self.addCleanup(throwaway.stop)
+        options = {"requests": 1, "users": 5, "houses": 10, "stdout": io.StringIO()}
+
+        # Write-only viewsets have no list and answer 500; they are skipped.
+        with self.assertLogs("django.request", "ERROR"):
+            call_command("benchmark_api", baseline=baseline, save=True, **options)
+        with open(baseline) as file:
+            results = json.load(file)
+        self.assertIn("advertisement_list-list", results)
+        self.assertIn("user_info", results)
+        throwaway_database.assert_called_once_with(False)
+
+        results["advertisement_list-list"]["queries"] -= 1
+        with open(baseline, "w") as file:
+            json.dump(results, file)
+        with self.assertLogs("django.request", "ERROR"):
+            with self.assertRaisesMessage(CommandError, "advertisement_list-list"):
+                call_command(
+                    "benchmark_api", baseline=baseline, no_seed=True, **options
+                )
+
+
+class QueryBudgetTests(APITestCase):
+    # Every routed viewset declares a query_budget per read action next to its
+    # class; the count must also not grow with the number of rows rendered.
+    # Requests take the worst case: a token that is not cached yet, an empty
+    # response cache and every expandable relation expanded.
+    registrations = [*urls.router.registry, *account_urls.router.registry]
+
+    def setUp(self):
+        cache.clear()
+        self.account = create_account("budget", address="Dhaka")
+        self.account.user.is_staff = True
+        self.account.user.save()
+        token = Token.objects.create(user=self.account.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def get(self, url, viewset, **params):
+        cache.clear()
+        expand = getattr(viewset.serializer_class, "expandable_fields", [])
+        if expand:
+            params["expand"] = ",".join(expand)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        return response, len(queries)
+
+    def seed(self, houses):
+        with self.captureOnCommitCallbacks(execute=True):
+            seeding.seed_dataset(users=4, houses=houses, seed=houses)
+        # Own every house and favourite every listing so that the owner and
+        # favourite endpoints grow with the dataset as well.
+        models.House.objects.update(owner=self.account)
+        self.account.favourites.set(
+            models.Advertisement.objects.filter(is_approved=True)
+        )
+        cache.clear()
+
+    def measure(self):
+        counts = {}
+        for prefix, viewset, basename in self.registrations:
+            budget = viewset.query_budget
+            if "list" not in budget:
+                continue
+            response, counts[(viewset, "list")] = self.get(
+                reverse(f"{basename}-list"), viewset, page_size=100
+            )
+            self.assertEqual(response.status_code, 200, prefix)
+
+            rows = response.data
+            if isinstance(rows, dict):
+                rows = rows["results"]
+            if "retrieve" in budget and rows:
+                response, counts[(viewset, "retrieve")] = self.get(
+                    reverse(f"{basename}-detail", args=[rows[-1]["id"]]), viewset
+                )
+                self.assertEqual(response.status_code, 200, prefix)
+        return counts
+
+    def test_every_viewset_declares_a_budget(self):
+        for prefix, viewset, basename in self.registrations:
+            with self.subTest(prefix=prefix):
+                self.assertIsInstance(getattr(viewset, "query_budget", None), dict)
+
+    def test_query_counts_are_independent_of_result_size(self):
+        self.seed(houses=3)
+        small = self.measure()
+        self.seed(houses=25)
+        large = self.measure()
+
+        for (viewset, action), count in large.items():
+            with self.subTest(viewset=viewset.__name__, action=action):
+                self.assertEqual(count, small[(viewset, action)])
+                self.assertLessEqual(count, viewset.query_budget[action])
+
+
+class OwnerDashboardTests(APITestCase):
+    def setUp(self):
+        self.owner = create_account("owner")
+        category = models.Category.objects.create(name="Flat", slug="flat")
+        self.advertisement = create_advertisement(
+            self.owner, category, is_approved=True
+        )
+        self.unlisted = models.House.objects.create(
+            owner=self.owner,
+            title="Unlisted",
+            description="Description",
+            location="Dhaka",
+            image="https://example.com/house.jpg",
+            price="500.00",
+        )
+        for number, status_value in enumerate(
+            ["PENDING", "PENDING", "ACCEPTED", "REJECTED"]
+        ):
+            tenant = create_account(f"tenant-{number}", mobile_number=f"01{number}")
+            models.RentRequest.objects.create(
+                advertisement=self.advertisement,
+                requested_by=tenant,
+                status=status_value,
+            )
+            tenant.favourites.add(self.advertisement)
+        for rating in (4, 5):
+            views.record_rating(self.advertisement.id, rating)
+        create_advertisement(create_account("other"), category)
+        self.client.force_authenticate(self.owner.user)
+
+    def test_list_aggregates_each_house_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/house/dashboard/")
+
+        rows = {row["id"]: row for row in response.data["results"]}
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            {
+                key: rows[self.advertisement.house_id][key]
+                for key in (
+                    "advertisement_id",
+                    "pending_requests",
+                    "accepted_requests",
+                    "rejected_requests",
+                    "favourite_count",
+                    "review_count",
+                    "rating_avg",
+                )
+            },
+            {
+                "advertisement_id": self.advertisement.id,
+                "pending_requests": 2,
+                "accepted_requests": 1,
+                "rejected_requests": 1,
+                "favourite_count": 4,
+                "review_count": 2,
+                "rating_avg": 4.5,
+            },
+        )
+        self.assertIsNone(rows[self.unlisted.id]["advertisement_id"])
+        self.assertEqual(rows[self.unlisted.id]["pending_requests"], 0)
+
+    def test_summary_totals_the_owner_houses(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/house/dashboard/summary/")
+
+        self.assertEqual(
+            response.data,
+            {
+                "houses": 2,
+                "advertisements": 1,
+                "review_count": 2,
+                "favourite_count": 4,
+                "pending_requests": 2,
+                "accepted_requests": 1,
+                "rejected_requests": 1,
+                "rating_avg": 4.5,
+            },
+        )
+
+    def test_requests_drill_down_serializes_requester_summary(self):
+        url = f"/house/dashboard/{self.advertisement.house_id}/requests/"
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"status": "pending"})
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {
+                "id",
+                "status",
+                "created_at",
+                "requested_by",
+                "username",
+                "first_name",
+                "last_name",
+                "mobile_number",
+                "image_thumbnail",
+            },
+        )
+        other = models.House.objects.exclude(owner=self.owner).get()
+        response = self.client.get(f"/house/dashboard/{other.id}/requests/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_requests_drill_down_rejects_non_numeric_pk(self):
+        response = self.client.get("/house/dashboard/abc/requests/")
+        self.assertEqual(response.status_code, 404)
@@ -3,6 +3,7 @@ from django.conf.urls.static import static
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     AcceptRentRequest,
     AdminAdvertisedHouseViewSet,
@@ -12,7 +13,13 @@ from .views import (
     CategoryViewSet,
     FavoritesAdvertisementsViewSet,
     HandleRentRequestViewSet,
+    HouseExportView,
+    HouseImportView,
+    HouseSearchViewSet,
     HouseViewSet,
+    ModerateAdvertisementsView,
+    ModerationQueueViewSet,
+    OwnerDashboardViewSet,
     RentRequestViewSet,
     ReviewViewSet,
     UserHouseViewSet,
@@ -48,6 +55,9 @@ router.register(
 router.register("request-rent", HandleRentRequestViewSet, basename="request-rent")
 router.register("show-rent", RentRequestViewSet, basename="show-rent")
 router.register("review", ReviewViewSet, basename="review")
+router.register("search", HouseSearchViewSet, basename="house-search")
+router.register("moderation", ModerationQueueViewSet, basename="moderation")
+router.register("dashboard", OwnerDashboardViewSet, basename="owner-dashboard")
 
 
 urlpatterns = [
@@ -57,6 +67,25 @@ urlpatterns = [
         AcceptRentRequest.as_view(),
         name="accept-rent-request",
     ),
+    path(
+        "moderate-advertisements/",
+        ModerateAdvertisementsView.as_view(),
+        name="moderate-advertisements",
+    ),
+    path(
+        "async/advertisements/",
+        async_views.advertisement_list,
+        name="async-advertisement-list",
+    ),
+    path(
+        "async/advertisements/<int:pk>/",
+        async_views.advertisement_detail,
+        name="async-advertisement-detail",
+    ),
+    path("async/categories/", async_views.category_list, name="async-category-list"),
+    path("async/reviews/", async_views.review_list, name="async-review-list"),
+    path("import/", HouseImportView.as_view(), name="house-import"),
+    path("export/", HouseExportView.as_view(), name="house-export"),
 ]
 
 
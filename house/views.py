@@ -1,6 +1,13 @@
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import pagination, status, viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import (
     BasePermission,
     IsAuthenticated,
@@ -9,7 +16,19 @@ from rest_framework.permissions import (
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from . import models, serializers
+from account.models import UserAccount
+
+from . import bulk, caching, models, search, serializers
+from .mixins import (
+    ConditionalViewSetMixin,
+    EagerLoadingViewSetMixin,
+    ListSerializerViewSetMixin,
+)
+from .pagination import (
+    CreatedAtCursorPagination,
+    OldestFirstCursorPagination,
+    ResultsSetPagination,
+)
 
 
 class IsAdmin(BasePermission):
@@ -20,15 +39,38 @@ class IsAdmin(BasePermission):
         return request.user and request.user.is_staff
 
 
-class ResultsSetPagination(pagination.PageNumberPagination):
-    page_size = 5
-    page_size_query_param = "page_size"
-    max_page_size = 100
-
-
-class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = models.Category.objects.all()
+class CategoryViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
+    queryset = models.Category.objects.order_by("id")
     serializer_class = serializers.CategorySerializer
+    query_budget = {"list": 2, "retrieve": 3}
+
+    def get_serializer_class(self):
+        if self.action == "counts":
+            return serializers.CategoryCountSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        return self.catalogue_response()
+
+    @action(detail=False)
+    def counts(self, request):
+        return self.catalogue_response()
+
+    def catalogue_response(self):
+        # Served from the in-process catalogue; the validators come from it
+        # too, so neither a 200 nor a 304 touches the database.
+        generation, categories = caching.get_category_catalogue()
+        validators = {
+            "generation": generation,
+            "max_0": max(
+                (category.updated_at for category in categories), default=None
+            ),
+        }
+        return self.validated_response(
+            validators,
+            lambda: Response(self.get_serializer(categories, many=True).data),
+            last_modified=False,
+        )
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -38,10 +80,15 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class HouseViewSet(viewsets.ModelViewSet):
+class HouseViewSet(
+    ConditionalViewSetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet
+):
     queryset = models.House.objects.all()
     serializer_class = serializers.HouseSerializer
+    query_budget = {"list": 4, "retrieve": 5}
+    pagination_class = CreatedAtCursorPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
+    conditional_fields = ["updated_at", "category__updated_at", "owner__updated_at"]
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -58,28 +105,31 @@ class HouseViewSet(viewsets.ModelViewSet):
 class AdvertiseRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = serializers.AdvertisementSerializer
+    # Write-only: list and retrieve have no queryset to read.
+    query_budget = {}
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             house_id = serializer.validated_data.get("house_id")
             try:
-                house = models.House.objects.get(pk=house_id)
-            except models.House.DoesNotExist:
-                return Response(
-                    {"error": "House not found."}, status=status.HTTP_404_NOT_FOUND
-                )
-
-            if models.Advertisement.objects.filter(house=house).exists():
+                with transaction.atomic():
+                    # The one-to-one constraint on Advertisement.house rejects
+                    # duplicates and rolls the flag back with them.
+                    if not models.House.objects.filter(pk=house_id).update(
+                        is_advertised=True, updated_at=timezone.now()
+                    ):
+                        return Response(
+                            {"error": "House not found."},
+                            status=status.HTTP_404_NOT_FOUND,
+                        )
+                    advertisement = serializer.save()
+            except IntegrityError:
                 return Response(
                     {"error": "Advertisement for this house already exists."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            advertisement = serializer.save()
-            house.is_advertised = True
-            house.save(update_fields=["is_advertised"])
-
             return Response(
                 {
                     "message": "Advertisement created successfully.",
@@ -93,14 +143,24 @@ class AdvertiseRequestViewSet(viewsets.ModelViewSet):
 class ApproveAdvertisementViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdmin]
     serializer_class = serializers.AdvertisementSerializer
+    # Write-only: list and retrieve have no queryset to read.
+    query_budget = {}
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             house_id = serializer.validated_data.get("house_id")
-            advertisement = models.Advertisement.objects.get(house=house_id)
-            advertisement.is_approved = True
-            advertisement.save()
+            if not models.Advertisement.objects.filter(house=house_id).update(
+                is_approved=True, is_rejected=False, updated_at=timezone.now()
+            ):
+                return Response(
+                    {"error": "Advertisement not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            caching.invalidate_advertisement_list()
+            caching.refresh_category_counts(
+                models.Category.objects.filter(house=house_id)
+            )
             return Response(
                 {"message": "Advertisement Approved."}, status=status.HTTP_200_OK
             )
@@ -108,54 +168,177 @@ class ApproveAdvertisementViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-# admin er sob
-class AdminAdvertisedHouseViewSet(viewsets.ModelViewSet):
+class ModerationQueueViewSet(
+    EagerLoadingViewSetMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
     permission_classes = [IsAdmin]
-    queryset = models.Advertisement.objects.all()
-    serializer_class = serializers.AdvertisementSerializer
+    queryset = models.Advertisement.objects.filter(is_approved=False, is_rejected=False)
+    serializer_class = serializers.ModerationAdvertisementSerializer
+    query_budget = {"list": 2}
+    pagination_class = OldestFirstCursorPagination
 
 
-class UserHouseViewSet(viewsets.ModelViewSet):
-    serializer_class = serializers.HouseSerializer
-    permission_classes = [IsAuthenticated]
+class ModerateAdvertisementsView(APIView):
+    permission_classes = [IsAdmin]
 
-    def get_queryset(self):
-        user_account = self.request.user.account
-        return models.House.objects.filter(owner=user_account)
+    def post(self, request):
+        serializer = serializers.ModerationActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        approve = serializer.validated_data["action"] == "approve"
+
+        ids = serializer.validated_data["ids"]
+        updated = models.Advertisement.objects.filter(id__in=ids).update(
+            is_approved=approve, is_rejected=not approve, updated_at=timezone.now()
+        )
+        if updated:
+            caching.invalidate_advertisement_list()
+            caching.refresh_category_counts(
+                models.Category.objects.filter(house__advertisement__in=ids)
+            )
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+
+# admin er sob
+class AdminAdvertisedHouseViewSet(
+    ListSerializerViewSetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet
+):
+    permission_classes = [IsAdmin]
+    queryset = models.Advertisement.objects.all()
+    serializer_class = serializers.AdvertisementSerializer
+    query_budget = {"list": 3, "retrieve": 4}
+    list_serializer_class = serializers.AdvertisementListSerializer
+    pagination_class = CreatedAtCursorPagination
+
+
+class AdvertisementListCacheMixin:
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        key = caching.advertisement_list_key(request)
+        cached = caching.get_cached_advertisement_list(key)
+        if cached is not None:
+            # Cached pages keep their ETag, so a hit needs no query even for
+            # conditional requests.
+            data, etag = cached
+            response = get_conditional_response(request, etag=etag) or Response(data)
+            response["X-Cache"] = "HIT"
+            if response.status_code == 200:
+                response["ETag"] = etag
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            caching.set_cached_advertisement_list(
+                key, (response.data, response.get("ETag"))
+            )
+        response["X-Cache"] = "MISS"
+        return response
 
 
-class AdvertisedHouseViewSet(viewsets.ModelViewSet):
+class AdvertisedHouseViewSet(
+    AdvertisementListCacheMixin,
+    ConditionalViewSetMixin,
+    ListSerializerViewSetMixin,
+    EagerLoadingViewSetMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = models.Advertisement.objects.filter(is_approved=True, is_rented=False)
     serializer_class = serializers.AdvertisementSerializer
+    query_budget = {"list": 5, "retrieve": 6}
+    list_serializer_class = serializers.AdvertisementListSerializer
+    pagination_class = CreatedAtCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["house__category"]
+    # Reviews bump their advertisement's updated_at through record_rating().
+    conditional_fields = [
+        "updated_at",
+        "house__updated_at",
+        "house__category__updated_at",
+        "house__owner__updated_at",
+    ]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = annotate_is_favourite(super().get_queryset(), self.request.user)
         category = self.request.query_params.get("category")
         if category:
             queryset = queryset.filter(house__category__id=category)
         return queryset
 
-
-class FavoritesAdvertisementsViewSet(viewsets.ModelViewSet):
+    def get_etag_extra(self):
+        # is_favourite is per user; favourite changes touch the account.
+        if not self.request.user.is_authenticated:
+            return ""
+        return self.request.user.account.updated_at
+
+
+class HouseSearchViewSet(
+    EagerLoadingViewSetMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    queryset = models.House.objects.filter(
+        advertisement__is_approved=True, advertisement__is_rented=False
+    )
+    serializer_class = serializers.HouseSearchResultSerializer
+    query_budget = {"list": 5}
+    pagination_class = ResultsSetPagination
+    filter_backends = []
+
+    def list(self, request, *args, **kwargs):
+        params = serializers.HouseSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        query = params.get("q")
+
+        queryset = search.filter_search(self.get_queryset(), query)
+        if params.get("location"):
+            queryset = queryset.filter(location__icontains=params["location"])
+        if "min_price" in params:
+            queryset = queryset.filter(price__gte=params["min_price"])
+        if "max_price" in params:
+            queryset = queryset.filter(price__lte=params["max_price"])
+
+        facets = search.category_facets(queryset)
+        if "category" in params:
+            queryset = queryset.filter(category__id=params["category"])
+
+        page = self.paginate_queryset(search.rank_search(queryset, query))
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data["facets"] = facets
+        return response
+
+
+class FavoritesAdvertisementsViewSet(
+    ListSerializerViewSetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     queryset = models.Advertisement.objects.filter(is_approved=True)
     serializer_class = serializers.AdvertisementSerializer
+    query_budget = {"list": 3, "retrieve": 4}
+    list_serializer_class = serializers.AdvertisementListSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        return annotate_is_favourite(super().get_queryset(), self.request.user)
 
 
-class UserHouseViewSet(viewsets.ModelViewSet):
+class UserHouseViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = models.House.objects.all()
     serializer_class = serializers.HouseSerializer
+    query_budget = {"list": 3, "retrieve": 4}
+    pagination_class = CreatedAtCursorPagination
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return models.House.objects.filter(owner=self.request.user.account)
+        return super().get_queryset().filter(owner=self.request.user.account)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = models.Review.objects.all()
     serializer_class = serializers.ReviewSerializer
+    query_budget = {"list": 2, "retrieve": 3}
+    pagination_class = CreatedAtCursorPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
@@ -169,43 +352,163 @@ class ReviewViewSet(viewsets.ModelViewSet):
     # print(queryset)
 
     def create(self, request, *args, **kwargs):
-        try:
-            serializer = self.serializer_class(data=request.data)
-            if serializer.is_valid():
-                advertisement = serializer.validated_data.get("advertisement")
-                advertisement = get_object_or_404(
-                    models.Advertisement, pk=advertisement.id
-                )
-                review = serializer.save(
-                    user=request.user.account, advertisement=advertisement
-                )
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid():
+            with transaction.atomic():
+                review = serializer.save(user=request.user.account)
+                record_rating(review.advertisement_id, review.rating)
+
+            return Response(
+                {"message": "Review added successfully.", "review_id": review.id},
+                status=status.HTTP_201_CREATED,
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def perform_update(self, serializer):
+        previous = serializer.instance.advertisement_id, serializer.instance.rating
+        with transaction.atomic():
+            review = serializer.save()
+            record_rating(*previous, delta=-1)
+            record_rating(review.advertisement_id, review.rating)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            record_rating(instance.advertisement_id, instance.rating, delta=-1)
 
-                return Response(
-                    {"message": "Review added successfully.", "review_id": review.id},
-                    status=status.HTTP_201_CREATED,
-                )
-        except:
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+def annotate_is_favourite(queryset, user):
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        is_favourite=Exists(
+            UserAccount.favourites.through.objects.filter(
+                useraccount__user=user, advertisement=OuterRef("pk")
+            )
+        )
+    )
+
+
+def annotate_dashboard(queryset):
+    # One grouped query: conditional counts over the rent request join and the
+    # favourites as a correlated subquery, so the two joins do not multiply.
+    favourites = (
+        UserAccount.favourites.through.objects.filter(
+            advertisement=OuterRef("advertisement")
+        )
+        .order_by()
+        .values("advertisement")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return queryset.only(
+        "id", "title", "location", "price", "is_advertised", "created_at"
+    ).annotate(
+        advertisement_id=F("advertisement__id"),
+        is_approved=F("advertisement__is_approved"),
+        is_rented=F("advertisement__is_rented"),
+        review_count=Coalesce(F("advertisement__review_count"), 0),
+        rating_avg=Coalesce(F("advertisement__rating_avg"), 0.0),
+        favourite_count=Coalesce(Subquery(favourites), 0),
+        **{
+            f"{value.lower()}_requests": Count(
+                "advertisement__rent_request",
+                filter=Q(advertisement__rent_request__status=value),
+            )
+            for value, _ in models.STATUS_CHOICES
+        },
+    )
+
+
+def record_rating(advertisement_id, rating, delta=1):
+    advertisement = models.Advertisement.objects.select_for_update().get(
+        pk=advertisement_id
+    )
+    advertisement.record_rating(rating, delta)
+    advertisement.save(
+        update_fields=[*models.Advertisement.REVIEW_STATS_FIELDS, "updated_at"]
+    )
+
+
+class OwnerDashboardViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    queryset = models.House.objects.all()
+    serializer_class = serializers.OwnerDashboardSerializer
+    pagination_class = CreatedAtCursorPagination
+    query_budget = {"list": 2, "summary": 2, "requests": 3}
+
+    def get_queryset(self):
+        return annotate_dashboard(
+            super().get_queryset().filter(owner=self.request.user.account)
+        )
+
+    @action(detail=False)
+    def summary(self, request):
+        counts = [
+            "review_count",
+            "favourite_count",
+            *(f"{value.lower()}_requests" for value, _ in models.STATUS_CHOICES),
+        ]
+        # Summed over the grouped per-house query, wrapped as a subquery.
+        totals = self.get_queryset().aggregate(
+            total_houses=Count("id"),
+            total_advertisements=Count("advertisement_id"),
+            total_rating=Sum(F("rating_avg") * F("review_count")),
+            **{f"total_{field}": Sum(field) for field in counts},
+        )
+        totals = {key[6:]: value or 0 for key, value in totals.items()}
+        rating_total = totals.pop("rating")
+        return Response(
+            {
+                **totals,
+                "rating_avg": (
+                    rating_total / totals["review_count"]
+                    if totals["review_count"]
+                    else 0
+                ),
+            }
+        )
+
+    @action(detail=True)
+    def requests(self, request, pk=None):
+        get_object_or_404(
+            models.House.objects.only("id"), pk=pk, owner=request.user.account
+        )
+        queryset = serializers.RentRequestSummarySerializer.setup_eager_loading(
+            models.RentRequest.objects.filter(advertisement__house=pk)
+        )
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            queryset = queryset.filter(status=status_filter.upper())
+        page = self.paginate_queryset(queryset)
+        serializer = serializers.RentRequestSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 class HandleRentRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = serializers.RentRequestSerializer
+    # Write-only: list and retrieve have no queryset to read.
+    query_budget = {}
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             advertisement = serializer.validated_data.get("advertisement")
-            print(advertisement)
             if advertisement.is_rented:
                 return Response(
                     {"error": "This advertisement has already been rented."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            if models.RentRequest.objects.filter(
-                advertisement=advertisement, requested_by=request.user.account
-            ).exists():
+            try:
+                with transaction.atomic():
+                    serializer.save(requested_by=request.user.account)
+                    if models.Advertisement.objects.filter(
+                        pk=advertisement.pk, is_requested=False
+                    ).update(is_requested=True, updated_at=timezone.now()):
+                        caching.invalidate_advertisement_list()
+            except IntegrityError:
                 return Response(
                     {
                         "error": "You have already sent a rent request for this advertisement."
@@ -213,10 +516,6 @@ class HandleRentRequestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            serializer.save(requested_by=request.user.account)
-            advertisement.is_requested = True
-            advertisement.save(update_fields=["is_requested"])
-
             return Response(
                 {"message": "Rent request sent successfully."},
                 status=status.HTTP_201_CREATED,
@@ -228,30 +527,49 @@ class AcceptRentRequest(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, rent_request_id):
-        rent_request = get_object_or_404(models.RentRequest, id=rent_request_id)
+        rent_request = get_object_or_404(
+            models.RentRequest.objects.select_related("advertisement__house"),
+            id=rent_request_id,
+        )
 
-        if request.user.account != rent_request.advertisement.house.owner:
+        if request.user.account.id != rent_request.advertisement.house.owner_id:
             return Response(
                 {"error": "You are not authorized to accept this request."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-
-        if rent_request.advertisement.is_rented:
+        if rent_request.status == "ACCEPTED":
+            # A retried accept (e.g. after a lost response) succeeds again.
             return Response(
-                {"error": "This house is already rented."},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"message": "Rent request accepted successfully."},
+                status=status.HTTP_200_OK,
             )
 
-        rent_request.status = "ACCEPTED"
-        rent_request.save()
-
-        models.RentRequest.objects.filter(
-            advertisement=rent_request.advertisement, status="PENDING"
-        ).update(status="REJECTED")
+        advertisement_id = rent_request.advertisement_id
+        with transaction.atomic():
+            # The row lock serialises concurrent accepts; the conditional
+            # update guarantees a single winner even where it is a no-op.
+            models.Advertisement.objects.select_for_update().only("id").get(
+                pk=advertisement_id
+            )
+            rented = models.Advertisement.objects.filter(
+                pk=advertisement_id, is_rented=False
+            ).update(is_rented=True, updated_at=timezone.now())
+            if not rented:
+                return Response(
+                    {"error": "This house is already rented."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        advertisement = rent_request.advertisement
-        advertisement.is_rented = True
-        advertisement.save()
+            models.RentRequest.objects.filter(pk=rent_request.pk).update(
+                status="ACCEPTED"
+            )
+            models.RentRequest.objects.filter(
+                advertisement_id=advertisement_id, status="PENDING"
+            ).update(status="REJECTED")
+            caching.invalidate_advertisement_list()
+            caching.refresh_category_counts(
+                models.Category.objects.filter(house__advertisement=advertisement_id)
+            )
 
         return Response(
             {
@@ -261,10 +579,66 @@ class AcceptRentRequest(APIView):
         )
 
 
-class RentRequestViewSet(viewsets.ModelViewSet):
+class HouseImportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Upload a CSV or JSON Lines file."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = bulk.detect_format(upload.name)
+        if file_format is None:
+            return Response(
+                {"error": "Only .csv and .jsonl files are supported."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not bulk.is_parseable(upload, file_format):
+            return Response(
+                {"error": "The file could not be parsed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        rows = bulk.read_rows(bulk.decode_lines(upload), file_format)
+        result = bulk.import_houses(rows, request.user.account)
+        return Response(
+            result,
+            status=(
+                status.HTTP_201_CREATED
+                if result["created"]
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
+class HouseExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in ("csv", "jsonl"):
+            return Response(
+                {"error": "file_format must be csv or jsonl."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        houses = models.House.objects.filter(owner=request.user.account)
+        response = StreamingHttpResponse(
+            bulk.export_houses(houses, file_format),
+            content_type="text/csv" if file_format == "csv" else "application/jsonl",
+        )
+        response["Content-Disposition"] = f'attachment; filename="houses.{file_format}"'
+        return response
+
+
+class RentRequestViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = models.RentRequest.objects.all()
     serializer_class = serializers.RentRequestShowSerializer
+    query_budget = {"list": 3, "retrieve": 5}
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         queryset = super().get_queryset()
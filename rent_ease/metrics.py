@@ -0,0 +1,168 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+# Durations of the instrumented phases of the current request, see timed().
+request_timings = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(phase):
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0) + time.perf_counter() - started
+
+
+class Histogram:
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        # labels -> [per-bucket counts..., sum, count]
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.setdefault(labels, [0] * (len(self.buckets) + 2))
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {series[-2]}"
+            yield f"{self.name}_count{{{labels}}} {series[-1]}"
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.series = {}
+
+    def inc(self, labels, value=1):
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.series.items()):
+            yield f"{self.name}{{{labels}}} {value}"
+
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time spent handling the request.", SECONDS
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries per request.",
+    (0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries.", SECONDS
+)
+SERIALIZE_DURATION = Histogram(
+    "http_request_serialize_duration_seconds",
+    "Time spent in serializer to_representation.",
+    SECONDS,
+)
+RENDER_DURATION = Histogram(
+    "http_request_render_duration_seconds",
+    "Time spent rendering the response body.",
+    SECONDS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response body.",
+    (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "http_request_query_budget_exceeded_total",
+    "Requests that ran more queries than the view's query_budget.",
+)
+THROTTLED = Counter(
+    "http_requests_throttled_total", "Requests rejected by a rate limit."
+)
+
+METRICS = [
+    REQUEST_DURATION,
+    DB_QUERIES,
+    DB_DURATION,
+    SERIALIZE_DURATION,
+    RENDER_DURATION,
+    RESPONSE_SIZE,
+    QUERY_BUDGET_EXCEEDED,
+    THROTTLED,
+]
+
+_lock = threading.Lock()
+
+
+def record(view, method, status, duration, queries, timings, size, over_budget):
+    labels = f'view="{view}",method="{method}",status="{status}"'
+    with _lock:
+        REQUEST_DURATION.observe(labels, duration)
+        DB_QUERIES.observe(labels, queries)
+        DB_DURATION.observe(labels, timings.get("db", 0))
+        SERIALIZE_DURATION.observe(labels, timings.get("serialize", 0))
+        RENDER_DURATION.observe(labels, timings.get("render", 0))
+        if size is not None:
+            RESPONSE_SIZE.observe(labels, size)
+        if over_budget:
+            QUERY_BUDGET_EXCEEDED.inc(f'view="{view}"')
+
+
+def record_throttled(scope):
+    with _lock:
+        THROTTLED.inc(f'scope="{scope}"')
+
+
+def expose():
+    # Imported here so that the project package does not depend on the apps
+    # at import time.
+    from house.caching import get_advertisement_list_stats
+
+    with _lock:
+        lines = [line for metric in METRICS for line in metric.expose()]
+    stats = get_advertisement_list_stats()
+    lines += [
+        "# HELP advertisement_list_cache_requests_total Advertisement list cache lookups.",
+        "# TYPE advertisement_list_cache_requests_total counter",
+        f'advertisement_list_cache_requests_total{{result="hit"}} {stats["hits"]}',
+        f'advertisement_list_cache_requests_total{{result="miss"}} {stats["misses"]}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    # The histograms are per process; every worker is scraped on its own.
+    # Without a token only logged-in staff may read them.
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        )
+    else:
+        allowed = request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(expose(), content_type="text/plain; version=0.0.4")
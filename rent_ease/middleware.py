@@ -0,0 +1,106 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    # Records latency, query count and time, serializer and render time and
+    # response size for every request, exposes them as Server-Timing and
+    # warns when a view runs more queries than its ``query_budget``. It runs
+    # natively under both WSGI and ASGI so async views are not adapted.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.instrument() as (timings, queries):
+            response = self.get_response(request)
+        return self.finish(request, response, timings, queries[0])
+
+    async def __acall__(self, request):
+        with self.instrument() as (timings, queries):
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, queries[0])
+
+    @contextmanager
+    def instrument(self):
+        timings = {}
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                timings["db"] = timings.get("db", 0) + time.perf_counter() - started
+
+        token = metrics.request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_query))
+                yield timings, queries
+        finally:
+            metrics.request_timings.reset(token)
+        timings["total"] = time.perf_counter() - started
+
+    def finish(self, request, response, timings, queries):
+        view, budget = self.resolve_view(request)
+        over_budget = budget is not None and queries > budget
+        if over_budget:
+            logger.warning(
+                "%s ran %d queries, over its budget of %d.", view, queries, budget
+            )
+        size = None if response.streaming else len(response.content)
+        metrics.record(
+            view,
+            request.method,
+            response.status_code,
+            timings["total"],
+            queries,
+            timings,
+            size,
+            over_budget,
+        )
+
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={timings.get("db", 0) * 1000:.1f};desc="{queries} queries"',
+                    *(
+                        f"{phase};dur={timings[phase] * 1000:.1f}"
+                        for phase in ("serialize", "render", "total")
+                        if phase in timings
+                    ),
+                ]
+            )
+        return response
+
+    def resolve_view(self, request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unmatched", None
+        view_class = getattr(match.func, "cls", None) or getattr(
+            match.func, "view_class", None
+        )
+        budget = getattr(view_class or match.func, "query_budget", None)
+        if isinstance(budget, dict):
+            actions = getattr(match.func, "actions", None) or {}
+            budget = budget.get(actions.get(request.method.lower()))
+        return match.view_name or match.route, budget
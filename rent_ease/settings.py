@@ -51,6 +51,9 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+# Seconds before the first retry of a failed outbox email, doubled per attempt.
+EMAIL_OUTBOX_BACKOFF = 60
+EMAIL_OUTBOX_MAX_BACKOFF = 60 * 60
 
 # Application definition
 
@@ -70,6 +73,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "rent_ease.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -117,6 +121,60 @@ DATABASES = {
     "default": dj_database_url.config(default=env("DATABASE"), conn_max_age=600)
 }
 
+# Cache
+# Local-memory (LRU) by default, e.g. CACHE_URL=redis://127.0.0.1:6379/1 to share it.
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+ADVERTISEMENT_LIST_CACHE_TIMEOUT = env.int(
+    "ADVERTISEMENT_LIST_CACHE_TIMEOUT", default=300
+)
+
+# Seconds a worker serves its in-process category catalogue before reloading
+# it. Invalidation is immediate across workers only with a shared CACHE_URL
+# (redis, memcached), see house.caching.get_category_catalogue.
+CATEGORY_CATALOGUE_MAX_AGE = env.int("CATEGORY_CATALOGUE_MAX_AGE", default=60)
+
+AUTH_TOKEN_CACHE_TIMEOUT = env.int("AUTH_TOKEN_CACHE_TIMEOUT", default=300)
+
+# Password hashing, see account.hashers. PASSWORD_HASHER (scrypt, argon2 or
+# pbkdf2) hashes new passwords; the others only verify stored hashes, which
+# are re-hashed with the preferred hasher and cost on the next login.
+# argon2 requires argon2-cffi.
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="scrypt")
+PASSWORD_HASHER_PBKDF2_ITERATIONS = env.int(
+    "PASSWORD_HASHER_PBKDF2_ITERATIONS", default=1_000_000
+)
+PASSWORD_HASHER_SCRYPT_WORK_FACTOR = env.int(
+    "PASSWORD_HASHER_SCRYPT_WORK_FACTOR", default=2**14
+)
+PASSWORD_HASHER_SCRYPT_BLOCK_SIZE = env.int(
+    "PASSWORD_HASHER_SCRYPT_BLOCK_SIZE", default=8
+)
+PASSWORD_HASHER_SCRYPT_PARALLELISM = env.int(
+    "PASSWORD_HASHER_SCRYPT_PARALLELISM", default=1
+)
+PASSWORD_HASHER_ARGON2_TIME_COST = env.int(
+    "PASSWORD_HASHER_ARGON2_TIME_COST", default=2
+)
+PASSWORD_HASHER_ARGON2_MEMORY_COST = env.int(
+    "PASSWORD_HASHER_ARGON2_MEMORY_COST", default=102400
+)
+PASSWORD_HASHER_ARGON2_PARALLELISM = env.int(
+    "PASSWORD_HASHER_ARGON2_PARALLELISM", default=8
+)
+_PASSWORD_HASHERS = {
+    "scrypt": "account.hashers.ScryptPasswordHasher",
+    "argon2": "account.hashers.Argon2PasswordHasher",
+    "pbkdf2": "account.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -137,11 +195,33 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "account.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_PAGINATION_CLASS": "house.pagination.ResultsSetPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "house.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Token buckets for the account endpoints, see account.throttling.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": env("LOGIN_IP_RATE", default="30/min"),
+        "login_username": env("LOGIN_USERNAME_RATE", default="10/min"),
+        "register_ip": env("REGISTER_IP_RATE", default="10/hour"),
+        "register_username": env("REGISTER_USERNAME_RATE", default="5/hour"),
+    },
 }
 
+# Fast paths for hot list endpoints, see house.plans and house.renderers.
+SERIALIZER_PLANS = env.bool("SERIALIZER_PLANS", default=True)
+FAST_JSON_RENDERER = env.bool("FAST_JSON_RENDERER", default=True)
+
+# Request instrumentation, see rent_ease.middleware. /metrics requires
+# "Authorization: Bearer <METRICS_TOKEN>" when a token is set, and a staff
+# session otherwise.
+SERVER_TIMING = env.bool("SERVER_TIMING", default=True)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -163,6 +243,25 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+STORAGES = {
+    "default": {
+        "BACKEND": env(
+            "FILE_STORAGE_BACKEND",
+            default="django.core.files.storage.FileSystemStorage",
+        ),
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+IMAGE_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+# Images that are not uploads must be http(s) or storage URLs up to this length.
+IMAGE_URL_MAX_LENGTH = 2048
+IMAGE_THUMBNAIL_SIZE = (400, 400)
+IMAGE_THUMBNAIL_ASYNC = env.bool("IMAGE_THUMBNAIL_ASYNC", default=True)
+IMAGE_THUMBNAIL_WORKERS = env.int("IMAGE_THUMBNAIL_WORKERS", default=2)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 